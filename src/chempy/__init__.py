@@ -3,7 +3,10 @@ from .errors import *
 from .utils import *
 from .element import Element
 from .compound import Compound
-from .equation import Equation
+from .equation import Equation, FrozenEquation
+from .corpus import EquationCorpus, SharedEquationCorpus
+from .network import ReactionNetwork
+from .thermo import ThermoStore, NASAPolynomialStore, ReactionProperties
 
 __all__ = (
     *data.__all__,
@@ -13,4 +16,11 @@ __all__ = (
     'Element',
     'Compound',
     'Equation',
+    'FrozenEquation',
+    'EquationCorpus',
+    'SharedEquationCorpus',
+    'ReactionNetwork',
+    'ThermoStore',
+    'NASAPolynomialStore',
+    'ReactionProperties',
 )
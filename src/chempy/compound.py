@@ -13,6 +13,9 @@ from .utils import (
     get_closing_index,
     tokenize_string,
     parse_elements_from_tokens,
+    Limits,
+    NO_LIMITS,
+    FrozenCounter,
 )
 from .utils.no_auto_init import NoAutoInitAndABCMeta
 from .element import Element
@@ -21,8 +24,18 @@ from collections import Counter
 from typing import Self
 import numpy as np
 
+Composition = tuple[tuple[str, int], ...]
+"""A canonical compound key: `(symbol, count)` pairs in atomic number order."""
+
 
 class Compound(Printable, metaclass=NoAutoInitAndABCMeta):
+    """An immutable chemical compound.
+
+    Instances are frozen once constructed, so they can be shared between
+    `Equation`s (and threads) without copying.
+    """
+    __slots__ = ('elements', 'string', '_vector', '_hash')
+
     def __new__(cls, *args, **kwargs) -> Self:
         if len(args) == 1:
             if isinstance(args[0], str):
@@ -36,14 +49,35 @@ class Compound(Printable, metaclass=NoAutoInitAndABCMeta):
     def __init__(self, elements: Counter[Element], string: str = None):
         """Constructs a compound from a number of `Element`s and an optional
         `string` to refer to the `Compound` by.
+
+        `elements` is copied into a read-only `FrozenCounter`, so later
+        changes to it don't affect `self`.
         """
-        self.elements = elements
-        self.string = string
+        set_attr = object.__setattr__
+        set_attr(self, 'elements', FrozenCounter(elements))
+        set_attr(self, 'string', string)
+        set_attr(self, '_vector', None)
+        set_attr(self, '_hash', None)
 
-        vector = np.zeros(NUMBER_OF_ELEMENTS, dtype=int)
-        for element, freq in self.elements.items():
-            vector += element.vector * freq
-        self.vector = vector
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable.')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable.')
+
+    @property
+    def vector(self) -> np.ndarray:
+        """The element composition of `self` indexed by atomic number - 1.
+
+        Computed on first access and cached.
+        """
+        if self._vector is None:
+            vector = np.zeros(NUMBER_OF_ELEMENTS, dtype=int)
+            for element, freq in self.elements.items():
+                vector[element.number-1] += freq
+            vector.flags.writeable = False
+            object.__setattr__(self, '_vector', vector)
+        return self._vector
 
     def __str__(self) -> str:
         if self.string is not None:
@@ -60,7 +94,7 @@ class Compound(Printable, metaclass=NoAutoInitAndABCMeta):
     def __repr__(self) -> str:
         return f"""
             {self.__class__.__name__}(
-                {self.elements},
+                {self.elements.copy()},
                 {'None' if self.string is None else f"'{self.string}'"},
             )
         """
@@ -71,14 +105,44 @@ class Compound(Printable, metaclass=NoAutoInitAndABCMeta):
                              f'and `{type(other).__name__}`')
         return self.elements == other.elements
     
+    def __reduce__(self) -> tuple:
+        """Pickles only the string and sparse composition of `self`, so
+        the `Element`s are re-interned when unpickled.
+        """
+        return self._from_composition, (self.composition, self.string)
+
+    @classmethod
+    def _from_composition(
+        cls,
+        composition: Composition,
+        string: str = None,
+    ) -> Self:
+        """Constructs a compound from its `composition`."""
+        elements = Counter({Element(symbol): freq
+                            for symbol, freq in composition})
+        return cls(elements, string)
+
+    @property
+    def composition(self) -> Composition:
+        """The canonical `(symbol, count)` pairs of `self`, ordered by
+        atomic number.
+        """
+        return tuple(sorted(
+            ((element.symbol, freq) for element, freq in self.elements.items()),
+            key=lambda tup: ATOMIC_NUMS[tup[0]],
+        ))
+
     def __hash__(self) -> int:
-        element_data = list(self.elements.items())
-        element_data.sort(key=lambda tup: ATOMIC_NUMS[tup[0].symbol])
-        return hash(tuple(element_data))
+        if self._hash is None:
+            element_data = list(self.elements.items())
+            element_data.sort(key=lambda tup: ATOMIC_NUMS[tup[0].symbol])
+            object.__setattr__(self, '_hash', hash(tuple(element_data)))
+        return self._hash
     
     def latex(self) -> str:
         """Returns a LaTeX string representation of the compound."""
-        tokens = tokenize_string(self.string)
+        # The string was checked against the limits it was parsed with.
+        tokens = tokenize_string(self.string, NO_LIMITS)
         previous_token = None
         string_frags = []
         while tokens:
@@ -111,26 +175,37 @@ class Compound(Printable, metaclass=NoAutoInitAndABCMeta):
         return ''.join(reversed(string_frags))
 
     def copy(self) -> Self:
-        return self.__class__(self.elements.copy(), self.string)
+        """Returns `self`, as `Compound`s are immutable."""
+        return self
 
     @classmethod
-    def parse_from_string(cls, compound_string: str) -> Self:
-        """Parses a given string into a `Compound` instance."""
+    def parse_from_string(
+        cls,
+        compound_string: str,
+        limits: Limits | None = None,
+    ) -> Self:
+        """Parses a given string into a `Compound` instance.
+
+        Raises a `ComplexityError` if the string exceeds `limits`
+        (`DEFAULT_LIMITS` if not given).
+        """
         compound_string = compound_string.replace(' ', '')
-        if not all(
-            c.isalnum()
-                or c in LEFT_DELS
-                or c in RIGHT_DELS
-            for c in compound_string
-        ):
-            raise ValueError('Invalid character found while '
-                             f'parsing "{compound_string}".')
-        if (sum(c in LEFT_DELS for c in compound_string)
-            != sum(c in RIGHT_DELS for c in compound_string)):
-            raise ValueError('Unequal left and right delimiters '
-                             f'in "{compound_string}".')
+        # Plain alphanumeric strings (no delimiters) can skip these checks.
+        if not compound_string.isalnum():
+            if not all(
+                c.isalnum()
+                    or c in LEFT_DELS
+                    or c in RIGHT_DELS
+                for c in compound_string
+            ):
+                raise ValueError('Invalid character found while '
+                                 f'parsing "{compound_string}".')
+            if (sum(c in LEFT_DELS for c in compound_string)
+                != sum(c in RIGHT_DELS for c in compound_string)):
+                raise ValueError('Unequal left and right delimiters '
+                                 f'in "{compound_string}".')
         
-        tokens = tokenize_string(compound_string)
+        tokens = tokenize_string(compound_string, limits)
         elements = parse_elements_from_tokens(tokens)
 
         while tokens[0] in LEFT_DELS\
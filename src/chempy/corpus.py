@@ -0,0 +1,486 @@
+"""
+TODO: Support other CSV dialects than the default (comma separated) one.
+"""
+
+from .utils import (
+    lex_equation,
+    FrozenCompoundCounter,
+    Limits,
+    DEFAULT_LIMITS,
+)
+from .compound import Compound, Composition
+from .equation import FrozenEquation
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from itertools import chain, islice
+from typing import Self
+import csv
+import os
+
+PARALLEL_MIN_EQUATIONS = 10_000
+"""Inputs with fewer equations than this (or than one chunk) are parsed
+in-process unless `processes` is given, since starting the worker processes
+takes longer than parsing them."""
+
+
+def _merge_terms(
+    terms: Iterable[tuple[int, int]],
+) -> tuple[tuple[int, int], ...]:
+    """Returns `terms` with the coefficients of a compound repeated on the
+    same side summed, in order of first appearance.
+    """
+    merged: dict[tuple[int, bool], int] = {}
+    for compound_id, coef in terms:
+        key = (compound_id, coef > 0)
+        merged[key] = merged.get(key, 0) + coef
+    return tuple((compound_id, coef)
+                 for (compound_id, _), coef in merged.items())
+
+
+def _parse_chunk(
+    lines: list[tuple[int, str]],
+    limits: Limits,
+    skip_invalid: bool,
+    location: str = 'equation',
+) -> tuple[list[tuple[str, Composition]],
+           list[tuple[tuple[int, int], ...] | None],
+           list[tuple[int, str]]]:
+    """Parses a chunk of `(number, equation string)` pairs, where the number
+    locates the string in the input and is reported as the `location` of
+    errors (run in the worker processes).
+
+    Compounds are parsed once per unique string and numbered locally, so only
+    plain tuples travel back to the parent process. Returns the compounds as
+    `(string, composition)`, each equation as `(local_index, coefficient)`
+    terms with negative coefficients for reactants (`None` if the line was
+    skipped) and the `(number, message)` of the skipped lines.
+    """
+    compounds = []
+    compound_ids: dict[str, int] = {}
+    composition_ids: dict[Composition, int] = {}
+    parsed_lines: dict[str, tuple[tuple[int, int], ...]] = {}
+    equations = []
+    errors = []
+    for number, line in lines:
+        if line in parsed_lines:
+            equations.append(parsed_lines[line])
+            continue
+        try:
+            reactant_terms, product_terms = lex_equation(line, limits)
+            terms = []
+            for sign, side_terms in ((-1, reactant_terms), (1, product_terms)):
+                for coef, compound_str in side_terms:
+                    if compound_str not in compound_ids:
+                        compound = Compound.parse_from_string(compound_str,
+                                                              limits)
+                        composition = compound.composition
+                        if composition not in composition_ids:
+                            composition_ids[composition] = len(compounds)
+                            compounds.append((compound.string, composition))
+                        compound_ids[compound_str] = \
+                            composition_ids[composition]
+                    terms.append((compound_ids[compound_str], sign*coef))
+        except ValueError as e:
+            if not skip_invalid:
+                raise ValueError(f'{e} ({location} {number})') from e
+            errors.append((number, str(e)))
+            equations.append(None)
+            continue
+        parsed_lines[line] = _merge_terms(terms)
+        equations.append(parsed_lines[line])
+    return compounds, equations, errors
+
+
+class EquationCorpus:
+    """A compact, deduplicated collection of `Equation`s.
+
+    Each unique compound (by composition) is stored once as its string and
+    composition, and each unique equation as a run of `(compound index,
+    coefficient)` terms in flat integer arrays, where negative coefficients
+    denote reactants. `Compound`s and the `FrozenEquation`s returned by
+    indexing are built on demand.
+    """
+    __slots__ = (
+        'skipped',
+        '_compound_table',
+        '_compound_cache',
+        '_compound_index',
+        '_equation_index',
+        '_offsets',
+        '_term_compounds',
+        '_term_coefficients',
+    )
+
+    def __init__(self, equations: Iterable[FrozenEquation] = ()) -> None:
+        """Constructs a corpus from any number of `equations`."""
+        self.skipped: list[tuple[int, str]] = []
+        self._compound_table: list[tuple[str, Composition]] = []
+        self._compound_cache: dict[int, Compound] = {}
+        self._compound_index: dict[Composition, int] = {}
+        self._equation_index: dict[tuple[tuple[int, int], ...], int] = {}
+        self._offsets = array('q', [0])
+        self._term_compounds = array('q')
+        self._term_coefficients = array('q')
+        for equation in equations:
+            self.add(equation)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> FrozenEquation:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('`EquationCorpus` index out of range.')
+        reactants, products = {}, {}
+        for compound_id, coef in self.terms(index):
+            compound = self.compound(compound_id)
+            if coef < 0:
+                reactants[compound] = reactants.get(compound, 0) - coef
+            else:
+                products[compound] = products.get(compound, 0) + coef
+        return FrozenEquation._from_counters(
+            FrozenCompoundCounter(reactants),
+            FrozenCompoundCounter(products),
+        )
+
+    def __iter__(self) -> Iterator[FrozenEquation]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(<{len(self)} equations, '
+                f'{len(self._compound_table)} compounds>)')
+
+    def __reduce__(self) -> tuple:
+        """Pickles the compound table and the raw term arrays; the lookup
+        indices are rebuilt when unpickled.
+        """
+        return self._from_arrays, (
+            self._compound_table,
+            self._offsets,
+            self._term_compounds,
+            self._term_coefficients,
+            self.skipped,
+        )
+
+    @classmethod
+    def _from_arrays(
+        cls,
+        compounds: list[tuple[str, Composition]],
+        offsets: array,
+        term_compounds: array,
+        term_coefficients: array,
+        skipped: list[tuple[int, str]] = (),
+    ) -> Self:
+        corpus = cls()
+        for string, composition in compounds:
+            corpus._add_compound(string, composition)
+        corpus._offsets = offsets
+        corpus._term_compounds = term_compounds
+        corpus._term_coefficients = term_coefficients
+        corpus.skipped.extend(skipped)
+        for index in range(len(corpus)):
+            corpus._equation_index[tuple(sorted(corpus.terms(index)))] = index
+        return corpus
+
+    def share(self) -> 'SharedEquationCorpus':
+        """Returns a read-only copy of `self` whose term arrays are stored
+        in a new shared memory block.
+
+        Passing the copy to other processes sends only the block's name and
+        the compound table. The returned corpus owns the block; use it as a
+        context manager (or call `close` and `unlink`) to free it.
+        """
+        arrays = (self._offsets, self._term_compounds,
+                  self._term_coefficients)
+        itemsize = self._offsets.itemsize
+        shm = SharedMemory(create=True,
+                           size=max(1, itemsize*sum(map(len, arrays))))
+        start = 0
+        for values in arrays:
+            stop = start + itemsize*len(values)
+            shm.buf[start:stop] = values.tobytes()
+            start = stop
+        return SharedEquationCorpus._attach(shm, len(self._offsets),
+                                            len(self._term_compounds),
+                                            self._compound_table, owner=True)
+
+    @property
+    def compounds(self) -> list[Compound]:
+        """The unique compounds of the corpus, in order of their indices."""
+        return [self.compound(i) for i in range(len(self._compound_table))]
+
+    def compound(self, index: int) -> Compound:
+        """Returns the compound at `index`, building it on first use."""
+        compound = self._compound_cache.get(index)
+        if compound is None:
+            string, composition = self._compound_table[index]
+            compound = Compound._from_composition(composition, string)
+            self._compound_cache[index] = compound
+        return compound
+
+    def terms(self, index: int) -> list[tuple[int, int]]:
+        """Returns the `(compound index, coefficient)` terms of the equation
+        at `index`, with negative coefficients for reactants.
+        """
+        start, stop = self._offsets[index], self._offsets[index+1]
+        return list(zip(self._term_compounds[start:stop],
+                        self._term_coefficients[start:stop]))
+
+    def _add_compound(self, string: str, composition: Composition) -> int:
+        """Returns the index of the compound with `composition`, adding it
+        if it isn't in the corpus yet.
+        """
+        index = self._compound_index.get(composition)
+        if index is None:
+            index = len(self._compound_table)
+            self._compound_index[composition] = index
+            self._compound_table.append((string, composition))
+        return index
+
+    def _add_terms(self, terms: tuple[tuple[int, int], ...]) -> int:
+        """Returns the index of the equation made of `terms`, adding it if
+        it isn't in the corpus yet.
+        """
+        key = tuple(sorted(terms))
+        index = self._equation_index.get(key)
+        if index is None:
+            index = len(self)
+            self._equation_index[key] = index
+            for compound_id, coef in terms:
+                self._term_compounds.append(compound_id)
+                self._term_coefficients.append(coef)
+            self._offsets.append(len(self._term_compounds))
+        return index
+
+    def add(self, equation: FrozenEquation) -> int:
+        """Adds `equation` unless an identical one is already present and
+        returns its index.
+        """
+        equation = equation.freeze()
+        terms = []
+        for sign, counter in ((-1, equation.reactants),
+                              (1, equation.products)):
+            for compound, coef in counter.items():
+                compound_id = self._add_compound(compound.string,
+                                                 compound.composition)
+                self._compound_cache.setdefault(compound_id, compound)
+                terms.append((compound_id, sign*coef))
+        return self._add_terms(_merge_terms(terms))
+
+    def _merge_chunk(
+        self,
+        compounds: list[tuple[str, Composition]],
+        equations: list[tuple[tuple[int, int], ...] | None],
+        errors: list[tuple[int, str]],
+    ) -> list[int | None]:
+        """Merges the output of `_parse_chunk` and returns the corpus index
+        of each of its equations.
+        """
+        ids = [self._add_compound(string, composition)
+               for string, composition in compounds]
+        self.skipped.extend(errors)
+        return [
+            None if terms is None else
+            self._add_terms(tuple((ids[i], coef) for i, coef in terms))
+            for terms in equations
+        ]
+
+    def extend(
+        self,
+        equation_strings: Iterable[str],
+        chunk_size: int = 10_000,
+        processes: int | None = None,
+        limits: Limits | None = None,
+        skip_invalid: bool = False,
+    ) -> list[int | None]:
+        """Parses and adds `equation_strings`, returning the corpus index of
+        each one (`None` for skipped lines).
+
+        The strings are consumed lazily in chunks of `chunk_size` which are
+        parsed by `processes` worker processes (in-process if 1, or if all
+        the strings fit in one chunk). If `processes` is `None`, inputs of
+        fewer than `PARALLEL_MIN_EQUATIONS` are parsed in-process and larger
+        ones use `os.cpu_count()` processes. Invalid equations raise a `ValueError` unless
+        `skip_invalid` is set, in which case their (0-based) positions in
+        `equation_strings` are recorded in `skipped`.
+        """
+        return self._extend(enumerate(equation_strings), chunk_size,
+                            processes, limits, skip_invalid, 'equation')
+
+    def _extend(
+        self,
+        numbered_strings: Iterable[tuple[int, str]],
+        chunk_size: int,
+        processes: int | None,
+        limits: Limits | None,
+        skip_invalid: bool,
+        location: str,
+    ) -> list[int | None]:
+        """Implements `extend` for `(number, equation string)` pairs, where
+        the numbers are reported as the `location` of invalid equations.
+        """
+        if limits is None:
+            limits = DEFAULT_LIMITS
+        strings = iter(numbered_strings)
+        head_size = chunk_size
+        if processes is None:
+            head_size = max(chunk_size, PARALLEL_MIN_EQUATIONS)
+        head = list(islice(strings, head_size))
+        if len(head) < head_size:
+            processes = 1
+        elif processes is None:
+            processes = os.cpu_count() or 1
+        strings = chain(head, strings)
+        chunks = iter(lambda: list(islice(strings, chunk_size)), [])
+
+        indices = []
+        if processes <= 1:
+            for chunk in chunks:
+                indices += self._merge_chunk(
+                    *_parse_chunk(chunk, limits, skip_invalid, location)
+                )
+            return indices
+
+        with ProcessPoolExecutor(processes) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_parse_chunk, chunk, limits,
+                                               skip_invalid, location))
+                # Bound the number of chunks held in memory at once.
+                if len(pending) >= 2*processes:
+                    indices += self._merge_chunk(*pending.popleft().result())
+            while pending:
+                indices += self._merge_chunk(*pending.popleft().result())
+        return indices
+
+    @classmethod
+    def load(
+        cls,
+        path: str | os.PathLike,
+        column: int | str | None = None,
+        header: bool = True,
+        chunk_size: int = 10_000,
+        processes: int | None = None,
+        limits: Limits | None = None,
+        skip_invalid: bool = False,
+    ) -> Self:
+        """Loads a corpus from a text file with one equation per line, or
+        from `column` (an index or header name) of a CSV file whose first
+        row is a `header` unless stated otherwise.
+
+        Blank lines and lines starting with `#` are ignored in text files.
+        Invalid equations are reported (and recorded in `skipped`) by their
+        1-based line number in the file. See `EquationCorpus.extend` for the
+        remaining parameters.
+        """
+        if isinstance(column, str) and not header:
+            raise ValueError('A CSV `column` can only be given by name if '
+                             'the file has a header.')
+        corpus = cls()
+        with open(path, newline='', encoding='utf-8') as file:
+            if column is None:
+                strings = ((number, line.strip())
+                           for number, line in enumerate(file, 1))
+                strings = ((number, line) for number, line in strings
+                           if line and not line.startswith('#'))
+            else:
+                rows = csv.reader(file)
+                if header:
+                    names = next(rows, [])
+                    if isinstance(column, str):
+                        column = names.index(column)
+                strings = ((rows.line_num, row[column]) for row in rows if row)
+            corpus._extend(strings, chunk_size, processes, limits,
+                           skip_invalid, 'line')
+        return corpus
+
+
+class SharedEquationCorpus(EquationCorpus):
+    """A read-only `EquationCorpus` whose term arrays live in shared memory.
+
+    Created by `EquationCorpus.share`. Unpickling attaches to the existing
+    block instead of copying the arrays, so worker processes can read the
+    equations without any per-equation serialization.
+    """
+    __slots__ = ('_shm', '_owner')
+
+    def __reduce__(self) -> tuple:
+        return self._attach, (
+            self._shm.name,
+            len(self._offsets),
+            len(self._term_compounds),
+            self._compound_table,
+        )
+
+    @classmethod
+    def _attach(
+        cls,
+        shm: SharedMemory | str,
+        n_offsets: int,
+        n_terms: int,
+        compounds: list[tuple[str, Composition]],
+        owner: bool = False,
+    ) -> Self:
+        """Constructs a corpus viewing the arrays in `shm` (a block or the
+        name of one), laid out as written by `EquationCorpus.share`.
+        """
+        if isinstance(shm, str):
+            shm = SharedMemory(shm)
+        corpus = cls()
+        for string, composition in compounds:
+            corpus._add_compound(string, composition)
+        itemsize = corpus._offsets.itemsize
+        bounds = [0, n_offsets, n_offsets + n_terms, n_offsets + 2*n_terms]
+        corpus._offsets, corpus._term_compounds, corpus._term_coefficients = (
+            shm.buf[itemsize*start:itemsize*stop].cast('q')
+            for start, stop in zip(bounds, bounds[1:])
+        )
+        corpus._shm = shm
+        corpus._owner = owner
+        return corpus
+
+    def __del__(self) -> None:
+        # The views must be released before the block can be closed.
+        if getattr(self, '_shm', None) is not None:
+            self.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._owner:
+            self.unlink()
+        self.close()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f'`{self.__class__.__name__}` is read-only.')
+
+    add = _read_only
+    extend = _read_only
+    share = _read_only
+
+    def close(self) -> None:
+        """Detaches this process from the shared memory block."""
+        for view in (self._offsets, self._term_compounds,
+                     self._term_coefficients):
+            if isinstance(view, memoryview):
+                view.release()
+        self._offsets = array('q', [0])
+        self._term_compounds = array('q')
+        self._term_coefficients = array('q')
+        self._shm.close()
+        self._shm = None
+
+    def unlink(self) -> None:
+        """Frees the shared memory block once every process has closed it.
+        Only the corpus returned by `share` may do this, before `close`.
+        """
+        if not self._owner:
+            raise TypeError('Only the creating process may unlink a '
+                            f'`{self.__class__.__name__}`.')
+        self._shm.unlink()
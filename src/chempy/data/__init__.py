@@ -1,9 +1,11 @@
 from .delimeters import LEFT_DELS, RIGHT_DELS
+from .arrows import ARROWS
 from .elements import ATOMIC_NUMS, NUMBER_OF_ELEMENTS
 
 __all__ = (
     'LEFT_DELS',
     'RIGHT_DELS',
+    'ARROWS',
     'ATOMIC_NUMS',
     'NUMBER_OF_ELEMENTS',
 )
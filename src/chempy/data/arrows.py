@@ -0,0 +1 @@
+ARROWS = ['<=>', '->', '→', '=']
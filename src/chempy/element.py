@@ -30,6 +30,8 @@ class Element(Printable):
         
         Takes the element `symbol` and derives other basic properties.
         """
+        if 'symbol' in self.__dict__:  # cached instance from `__new__`
+            return
         self.symbol = symbol
         self.number = ATOMIC_NUMS[symbol]
 
@@ -50,6 +52,12 @@ class Element(Printable):
         else:
             return fr'\text{{{self.symbol}}}'
     
+    def __reduce__(self) -> tuple:
+        """Pickles only the symbol so that unpickling returns the cached
+        instance.
+        """
+        return self.__class__, (self.symbol,)
+
     def __hash__(self):
         """`Element`s can be hashed with their ids as there is only ever one
         instance per unique type of element.
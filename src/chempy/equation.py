@@ -4,20 +4,37 @@ before using the current method for better answers.
 """
 
 from .printable import Printable
-from .errors import BalancingError
+from .errors import BalancingError, BudgetExceededError
 from .utils import (
     solve,
-    tokenize_string,
+    lex_equation,
     CompoundCounter,
+    FrozenCompoundCounter,
     NoAutoInitAndABCMeta,
+    balancing_system,
+    Limits,
+    DEFAULT_LIMITS,
 )
 from .compound import Compound
+from .thermo import ThermoStore, ReactionProperties
 from typing import Self
 from itertools import chain
 import numpy as np
+import numpy.typing as npt
 
 
-class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
+class FrozenEquation(Printable, metaclass=NoAutoInitAndABCMeta):
+    """An immutable chemical equation.
+
+    Every operation returns a new equation that shares its `Compound`s with
+    `self` instead of copying them. See `Equation` for the mutable variant.
+
+    Equations compare equal when they have the same terms. Since `Equation`
+    subclasses `FrozenEquation`, an `isinstance` check doesn't guarantee
+    immutability: call `freeze()` before holding on to an equation.
+    """
+    __slots__ = ('reactants', 'products')
+    _counter_type = FrozenCompoundCounter
 
     def __new__(cls, *args, **kwargs) -> Self:
         if len(args) == 1:
@@ -43,8 +60,60 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
             raise TypeError('Parameters `reactants` and `products` to '
                             '`Equation.__init__` must be `CompoundCounter`s, '
                             f'not `{products.__class__.__name__}`s.')
-        self.reactants = reactants
-        self.products = products
+        object.__setattr__(self, 'reactants', self._coerce(reactants))
+        object.__setattr__(self, 'products', self._coerce(products))
+
+    @classmethod
+    def _coerce(cls, counter: CompoundCounter) -> CompoundCounter:
+        """Returns `counter` as an instance of `cls._counter_type`,
+        converting only if necessary.
+        """
+        if type(counter) is cls._counter_type:
+            return counter
+        return cls._counter_type(counter)
+
+    @classmethod
+    def _from_counters(
+        cls,
+        reactants: CompoundCounter,
+        products: CompoundCounter,
+    ) -> Self:
+        """Constructs an instance without the type checks and constructor
+        dispatch of `__new__`. For internal use with trusted counters.
+        """
+        obj = object.__new__(cls)
+        object.__setattr__(obj, 'reactants', cls._coerce(reactants))
+        object.__setattr__(obj, 'products', cls._coerce(products))
+        return obj
+
+    def __reduce__(self) -> tuple:
+        """Pickles `self` as two tuples of `(compound, coefficient)` terms."""
+        return self._from_terms, (tuple(self.reactants.items()),
+                                  tuple(self.products.items()))
+
+    @classmethod
+    def _from_terms(
+        cls,
+        reactants: tuple[tuple[Compound, int], ...],
+        products: tuple[tuple[Compound, int], ...],
+    ) -> Self:
+        return cls._from_counters(cls._counter_type(reactants),
+                                  cls._counter_type(products))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable.')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'`{self.__class__.__name__}` is immutable.')
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FrozenEquation):
+            return NotImplemented
+        return (self.reactants == other.reactants
+                and self.products == other.products)
+
+    def __hash__(self) -> int:
+        return hash((self.reactants, self.products))
     
     def __str__(self) -> str:
         reactants_string = ' + '.join([
@@ -80,19 +149,22 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
             + '+'.join(product_strs)
     
     def copy(self) -> Self:
-        return self.__class__(
-            self.reactants.copy(),
-            self.products.copy(),
+        """Returns `self`, as `FrozenEquation`s are immutable."""
+        return self
+
+    def freeze(self) -> 'FrozenEquation':
+        """Returns an immutable version of `self`."""
+        if type(self) is FrozenEquation:
+            return self
+        return FrozenEquation._from_counters(self.reactants, self.products)
+
+    def thaw(self) -> 'Equation':
+        """Returns a mutable version of `self`."""
+        return Equation._from_counters(
+            CompoundCounter(self.reactants),
+            CompoundCounter(self.products),
         )
     
-    def _set_self(self, new_self: Self) -> None:
-        """Sets the attributes of `self` to the attributes of `new_self`.
-        
-        Required to get around Python's mutability syntax/rules."""
-        self.reactants = new_self.reactants
-        self.products = new_self.products
-        self.coefficients = new_self.coefficients
-    
     def __mul__(self, other: int) -> Self:
         """Returns an `Equation` with the coefficients of `self`
         multiplied by an integer.
@@ -102,19 +174,19 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
                             f'integers, not `{other.__class__.__name__}`s.')
         reactants = self.reactants * other
         products = self.products * other
-        return self.__class__(reactants, products)
+        return self._from_counters(reactants, products)
     
     def __rmul__(self, other: int) -> Self:
         return self * other
 
     def __add__(self, other: Self) -> Self:
         """Returns an addition of two `Equation`s in parallel."""
-        if not isinstance(other, Equation):
+        if not isinstance(other, FrozenEquation):
             raise TypeError('`Equation`s can only be added to other '
                             f'`Equation`s, not `{other.__class__.__name__}`s.')
         reactants = self.reactants + other.reactants
         products = self.products + other.products
-        return self.__class__(reactants, products)
+        return self._from_counters(reactants, products)
     
     def __sub__(self, other: Self) -> Self:
         return self + -1*other
@@ -128,7 +200,7 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
                             f'integers, not `{other.__class__.__name__}`s.')
         reactants = self.reactants / other
         products = self.products / other
-        return self.__class__(reactants, products)
+        return self._from_counters(reactants, products)
     
     def _get_max_coefficient(self) -> int:
         """Returns the maximum integer that can be reduced out of
@@ -152,12 +224,6 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
         """
         return self / self._get_max_coefficient()
     
-    def reduce(self) -> None:
-        """A mutable version of `Equation.reduced` that updates `self` to
-        the reduced version of `self`.
-        """
-        self._set_self(self.reduced())
-    
     def is_reduced(self) -> bool:
         """"Returns `True` if the `Equation` is reduced else `False`."""
         return self._get_max_coefficient() == 1
@@ -202,7 +268,7 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
         >>> equation1.extended(equation2)
         H2O2 -> H2 + 2(O)
         """
-        if not isinstance(other, (Equation, list)):
+        if not isinstance(other, (FrozenEquation, list)):
             raise TypeError('`Equation.extended` can only be passed other '
                             '`Equation` or `list[Equation] instances.')
         
@@ -220,13 +286,12 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
         reactants = CompoundCounter({comp: 1 for comp in reactants_set})
         products = CompoundCounter({comp: 1 for comp in products_set})
 
-        equation = self.__class__(reactants, products)
         try:
-            equation.balance()
+            return self._from_counters(reactants, products).balanced()
+        except BudgetExceededError:
+            raise
         except BalancingError:
             pass
-        else:
-            return equation
         
         mul = self._max_mul_in_products(other.reactants)
         intermediates = other.reactants * mul
@@ -242,32 +307,19 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
         # print(f'reactants = {reactants}')
         # print(f'products = {products}')
         
-        equation = self.__class__(reactants, products)
+        equation = self._from_counters(reactants, products)
         if self.is_balanced() and other.is_balanced():
             assert equation.is_balanced()
         return equation.reduced()
 
-    def extend(self, other: Self) -> None:
-        """A mutable version of `Equation.extended` that updates `self` to
-        the extension of `self` and `other`.
-        """
-        if not isinstance(other, (Equation, list)):
-            raise TypeError('`Equation.extend` can only be passed other '
-                            '`Equation` or `list[Equation] instances.')
-        self._set_self(self.extended(other))
-
     def is_balanced(self) -> bool:
         """"Returns `True` if the `Equation` is balanced else `False`."""
-        reactants_vec = np.sum(np.array([
-            comp.vector * coef
-            for comp, coef in self.reactants.items()
-        ]), axis=0)
-        products_vec = np.sum(np.array([
-            comp.vector * coef
-            for comp, coef in self.products.items()
-        ]), axis=0)
-
-        return np.allclose(reactants_vec, products_vec)
+        coefficients = np.array([*self.reactants.values(),
+                                 *(-coef for coef in self.products.values())],
+                                dtype=np.int_)
+        vectors = np.array([comp.vector for comp in chain(self.reactants,
+                                                          self.products)])
+        return not np.any(coefficients @ vectors)
     
     def assert_balanced(self) -> Self:
         """Asserts that `self` is balanced and returns `self`."""
@@ -276,68 +328,65 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
                                     'balanced as asserted.')
         return self
 
-    def balance(self) -> None:
-        """Finds the coefficients corresponding to the balanced `Equation`
-        and writes them to `self.coefficients`.
+    def balanced(self, limits: Limits | None = None) -> Self:
+        """Returns a balanced version of `self`.
+
+        Raises a `BudgetExceededError` if solving exceeds the time or
+        iteration budget in `limits` (`DEFAULT_LIMITS` if not given).
         """
         reactants = list(self.reactants.keys())
         products = list(self.products.keys())
-        reactant_vecs = np.array([comp.vector for comp in reactants])
-        product_vecs = np.array([comp.vector for comp in products])
-    
-        system = np.hstack((reactant_vecs.T, -product_vecs.T))
-        coefficients = solve(system)
-
-        reactant_coefs = coefficients[:len(reactants)]
-        product_coefs = coefficients[len(reactants):]
-        for reactant, coef in zip(reactants, reactant_coefs):
-            self.reactants[reactant] = coef
-        for product, coef in zip(products, product_coefs):
-            self.products[product] = coef
-        
-        if not self.is_balanced():
-            raise Exception(f'An equation was incorrectly balanced to {self}')
-    
-    def balanced(self) -> Self:
-        """Returns a balanced version of `self`."""
-        equation = self.copy()
-        equation.balance()
+        system = balancing_system(reactants, products)
+        coefficients = solve(system, limits).tolist()
+
+        equation = self._from_counters(
+            CompoundCounter(zip(reactants, coefficients[:len(reactants)])),
+            CompoundCounter(zip(products, coefficients[len(reactants):])),
+        )
+        if not equation.is_balanced():
+            raise Exception('An equation was incorrectly balanced '
+                            f'to {equation}')
         return equation
     
+    def reaction_properties(
+        self,
+        store: ThermoStore,
+        temperatures: npt.ArrayLike,
+    ) -> ReactionProperties:
+        """Returns the standard reaction enthalpy, entropy and Gibbs energy
+        of the balanced `self` at each of `temperatures` (K), using the
+        species data in `store`.
+
+        Use `ThermoStore.reaction_properties` to evaluate many equations at
+        once.
+        """
+        properties = store.reaction_properties([self], temperatures)
+        return ReactionProperties(*(values[0] for values in properties))
+
     @classmethod
-    def parse_from_string(cls, equation_string: str) -> Self:
-        """Parses a given string into an `Equation` instance."""
-        if '->' in equation_string:
-            reactants_str, products_str = equation_string.split('->')
-        elif '→' in equation_string:
-            reactants_str, products_str = equation_string.split('→')
-        else:
-            raise ValueError('Invalid equation syntax. Seperate '
-                             'reactants and products with "->".')
+    def parse_from_string(
+        cls,
+        equation_string: str,
+        limits: Limits | None = None,
+    ) -> Self:
+        """Parses a given string into an `Equation` instance.
+
+        Raises a `ComplexityError` if the equation or any of its compounds
+        exceed `limits` (`DEFAULT_LIMITS` if not given).
+        """
+        if limits is None:
+            limits = DEFAULT_LIMITS
+        reactant_terms, product_terms = lex_equation(equation_string, limits)
         
         reactants = CompoundCounter()
-        for reactant_str in reactants_str.split('+'):
-            first_token = tokenize_string(reactant_str)[0]
-            if isinstance(first_token, int):
-                reactant = Compound.parse_from_string(
-                    reactant_str.strip().removeprefix(str(first_token))
-                )
-                reactants[reactant] += first_token
-            else:
-                reactant = Compound.parse_from_string(reactant_str)
-                reactants[reactant] += 1
+        for coef, reactant_str in reactant_terms:
+            reactant = Compound.parse_from_string(reactant_str, limits)
+            reactants[reactant] += coef
         
         products = CompoundCounter()
-        for product_str in products_str.split('+'):
-            first_token = tokenize_string(product_str)[0]
-            if isinstance(first_token, int):
-                product = Compound.parse_from_string(
-                    product_str.strip().removeprefix(str(first_token))
-                )
-                products[product] += first_token
-            else:
-                product = Compound.parse_from_string(product_str)
-                products[product] += 1
+        for coef, product_str in product_terms:
+            product = Compound.parse_from_string(product_str, limits)
+            products[product] += coef
 
         return cls(reactants, products)
 
@@ -345,3 +394,52 @@ class Equation(Printable, metaclass=NoAutoInitAndABCMeta):
     def parse_from_list(cls, equation_strings: list[str]) -> list[Self]:
         """Parses a list of strings into a list of `Compound`s."""
         return list(map(cls.parse_from_string, equation_strings))
+
+
+class Equation(FrozenEquation):
+    """A mutable chemical equation.
+
+    The in-place methods are copy-on-write: they rebind `reactants` and
+    `products` to new counters rather than modifying the existing ones, so
+    counters handed out earlier are never changed underneath their users.
+    """
+    __slots__ = ()
+    _counter_type = CompoundCounter
+
+    __setattr__ = object.__setattr__
+    __delattr__ = object.__delattr__
+    __hash__ = None
+
+    def copy(self) -> Self:
+        return self._from_counters(
+            self.reactants.copy(),
+            self.products.copy(),
+        )
+
+    def _set_self(self, new_self: FrozenEquation) -> None:
+        """Sets the attributes of `self` to the attributes of `new_self`.
+        
+        Required to get around Python's mutability syntax/rules."""
+        self.reactants = self._coerce(new_self.reactants)
+        self.products = self._coerce(new_self.products)
+
+    def reduce(self) -> None:
+        """A mutable version of `Equation.reduced` that updates `self` to
+        the reduced version of `self`.
+        """
+        self._set_self(self.reduced())
+
+    def extend(self, other: FrozenEquation | list[FrozenEquation]) -> None:
+        """A mutable version of `Equation.extended` that updates `self` to
+        the extension of `self` and `other`.
+        """
+        if not isinstance(other, (FrozenEquation, list)):
+            raise TypeError('`Equation.extend` can only be passed other '
+                            '`Equation` or `list[Equation] instances.')
+        self._set_self(self.extended(other))
+
+    def balance(self, limits: Limits | None = None) -> None:
+        """A mutable version of `Equation.balanced` that updates `self` to
+        the balanced version of `self`.
+        """
+        self._set_self(self.balanced(limits))
@@ -1,5 +1,9 @@
 from .balancing_error import BalancingError
+from .budget_exceeded_error import BudgetExceededError
+from .complexity_error import ComplexityError
 
 __all__ = (
     'BalancingError',
+    'BudgetExceededError',
+    'ComplexityError',
 )
@@ -0,0 +1,14 @@
+from .balancing_error import BalancingError
+import numpy as np
+import numpy.typing as npt
+
+
+class BudgetExceededError(BalancingError):
+    def __init__(
+        self,
+        message: str,
+        results: npt.NDArray[np.float_] = None,
+        ratios: npt.NDArray[np.float_] = None,
+    ) -> None:
+        """Raised when the solver runs out of its time or iteration budget."""
+        super().__init__(message, results, ratios)
@@ -0,0 +1,11 @@
+class ComplexityError(ValueError):
+    def __init__(self, message: str, limit: str, value: int) -> None:
+        """Raised when an input exceeds one of the configured `Limits`.
+
+        `limit` is the name of the exceeded attribute of `Limits` and
+        `value` is the offending value.
+        """
+        super().__init__(message)
+
+        self.limit = limit
+        self.value = value
@@ -0,0 +1,425 @@
+"""
+Randomized correctness and performance harness for the balancer.
+
+Run `python -m chempy.harness --help` for the command line interface.
+"""
+
+from .data import LEFT_DELS, RIGHT_DELS, ATOMIC_NUMS
+from .errors import BalancingError
+from .utils import solve, stoichiometric_matrix
+from .compound import Compound
+from .equation import FrozenEquation
+from collections import Counter, defaultdict
+from collections.abc import Callable, Sequence
+from fractions import Fraction
+from math import gcd, lcm
+from time import perf_counter
+import argparse
+import json
+import numpy as np
+import numpy.typing as npt
+import os
+import random
+import sys
+
+Engine = Callable[[npt.ArrayLike], npt.NDArray[np.int_]]
+"""A balancing engine: maps a stoichiometric matrix to its positive, reduced
+integer null space vector, or raises a `BalancingError`."""
+
+COMMON_ELEMENTS = (
+    'H', 'C', 'N', 'O', 'F', 'Na', 'Mg', 'Al', 'Si', 'P',
+    'S', 'Cl', 'K', 'Ca', 'Mn', 'Fe', 'Cu', 'Zn', 'Br', 'I',
+)
+
+COMPOSITE_MIN_SIZE = 16
+"""Cases of at least this size are composite reactions (see
+`random_composite_reaction`) with about twice as many compounds, since
+random reactions that large are almost never uniquely balanceable."""
+
+
+def random_formula(
+    rng: random.Random,
+    elements: Sequence[str] = COMMON_ELEMENTS,
+    max_depth: int = 2,
+    max_parts: int = 4,
+    max_count: int = 9,
+) -> str:
+    """Returns a random valid compound formula with up to `max_depth` levels
+    of nested delimiter groups, each randomly followed by a multiplier.
+    """
+    parts = []
+    for _ in range(rng.randint(1, max_parts)):
+        if max_depth > 0 and rng.random() < 0.25:
+            i = rng.randrange(len(LEFT_DELS))
+            inner = random_formula(rng, elements, max_depth-1,
+                                   max(1, max_parts-1), max_count)
+            part = LEFT_DELS[i] + inner + RIGHT_DELS[i]
+        else:
+            part = rng.choice(elements)
+        count = rng.randint(1, max_count)
+        parts.append(part + (str(count) if count != 1 else ''))
+    return ''.join(parts)
+
+
+def _flat_formula(composition: Counter[str]) -> str:
+    return ''.join(f'{symbol}{count}' if count != 1 else symbol
+                   for symbol, count in composition.items())
+
+
+def random_reaction(
+    rng: random.Random,
+    n_reactants: int,
+    n_products: int,
+    elements: Sequence[str] = COMMON_ELEMENTS,
+    max_coefficient: int = 6,
+) -> str:
+    """Returns a random balanceable reaction string.
+
+    The reactants are random formulas with random coefficients; their pooled
+    atoms are then split at random between `n_products` products, so the
+    reaction is balanced by construction (though its coefficients need not
+    be unique).
+    """
+    reactants = [random_formula(rng, elements) for _ in range(n_reactants)]
+    coefficients = [rng.randint(1, max_coefficient) for _ in reactants]
+    pool = Counter()
+    for formula, coef in zip(reactants, coefficients):
+        compound = Compound.parse_from_string(formula)
+        for element, count in compound.elements.items():
+            pool[element.symbol] += count * coef
+
+    atoms = [symbol for symbol, count in pool.items() for _ in range(count)]
+    n_products = min(n_products, len(atoms))
+    rng.shuffle(atoms)
+    cuts = sorted(rng.sample(range(1, len(atoms)), n_products-1))
+    products = [
+        _flat_formula(Counter(atoms[start:stop]))
+        for start, stop in zip([0, *cuts], [*cuts, len(atoms)])
+    ]
+    return (' + '.join(f'{c}{r}' for c, r in zip(coefficients, reactants))
+            + ' -> ' + ' + '.join(products))
+
+
+def random_composite_reaction(
+    rng: random.Random,
+    n_compounds: int,
+    infeasible: bool = False,
+    elements: Sequence[str] = tuple(ATOMIC_NUMS),
+) -> str:
+    """Returns a reaction of at least `n_compounds` compounds that is
+    uniquely balanceable per connected component: it joins small random
+    reactions over disjoint sets of `elements`, each kept only if the
+    reference classifies it as `'unique'`.
+
+    If `infeasible`, a product made of an otherwise unused element is
+    added, so the reaction can't be balanced.
+    """
+    pool = list(elements)
+    rng.shuffle(pool)
+    reactants, products = [], []
+    size = 0
+    while size < n_compounds:
+        if len(pool) < 4:
+            raise ValueError(f'Too few elements for {n_compounds} compounds.')
+        subset = [pool.pop() for _ in range(rng.randint(2, 3))]
+        for _ in range(100):
+            # Uniqueness needs one compound more than there are elements.
+            n_reactants = rng.randint(1, len(subset))
+            equation_str = random_reaction(rng, n_reactants,
+                                           len(subset)+1 - n_reactants, subset)
+            equation = FrozenEquation.parse_from_string(equation_str)
+            system = stoichiometric_matrix(list(equation.reactants),
+                                           list(equation.products))
+            if reference_solution(system.toarray())[0] == 'unique':
+                left, right = equation_str.split(' -> ')
+                reactants.append(left)
+                products.append(right)
+                size += system.shape[1]
+                break
+    if infeasible:
+        products.append(random_formula(rng, [pool.pop()], max_depth=0))
+    return ' + '.join(reactants) + ' -> ' + ' + '.join(products)
+
+
+def exact_null_space(system: npt.ArrayLike) -> list[list[Fraction]]:
+    """Returns a basis of the null space of the integer matrix `system`,
+    computed exactly over the rationals.
+    """
+    rows = [[Fraction(int(v)) for v in row] for row in np.asarray(system)]
+    n_cols = np.shape(system)[1]
+    pivots = []
+    r = 0
+    for c in range(n_cols):
+        pivot = next((i for i in range(r, len(rows)) if rows[i][c]), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        rows[r] = [v / rows[r][c] for v in rows[r]]
+        for i in range(len(rows)):
+            if i != r and rows[i][c]:
+                factor = rows[i][c]
+                rows[i] = [a - factor*b for a, b in zip(rows[i], rows[r])]
+        pivots.append(c)
+        r += 1
+        if r == len(rows):
+            break
+
+    basis = []
+    for free in (c for c in range(n_cols) if c not in pivots):
+        vector = [Fraction(0)] * n_cols
+        vector[free] = Fraction(1)
+        for i, c in enumerate(pivots):
+            vector[c] = -rows[i][free]
+        basis.append(vector)
+    return basis
+
+
+def _column_components(system: npt.NDArray[np.int_]) -> list[list[int]]:
+    """Returns the columns of each group of compounds linked (directly or
+    through others) by sharing an element.
+    """
+    n_cols = system.shape[1]
+    unseen = set(range(n_cols))
+    components = []
+    while unseen:
+        stack = [unseen.pop()]
+        component = []
+        while stack:
+            col = stack.pop()
+            component.append(col)
+            for row in np.flatnonzero(system[:, col]):
+                for other in np.flatnonzero(system[row]):
+                    if other in unseen:
+                        unseen.remove(other)
+                        stack.append(int(other))
+        components.append(sorted(component))
+    return components
+
+
+def reference_solution(
+    system: npt.ArrayLike,
+) -> tuple[str, npt.NDArray[np.int_] | None]:
+    """Classifies `system` exactly as `'unique'` (returning its positive
+    solution), `'infeasible'` or `'ambiguous'` (null space of dimension
+    > 1).
+
+    Like `solve`, each connected component of compounds is classified on
+    its own, and a unique solution is reduced per component.
+    """
+    system = np.asarray(system)
+    solution = np.zeros(system.shape[1], dtype=np.int_)
+    kinds = set()
+    for cols in _column_components(system):
+        kind, values = _reference_connected(system[:, cols])
+        kinds.add(kind)
+        if kind == 'unique':
+            solution[cols] = values
+    for kind in ('infeasible', 'ambiguous'):
+        if kind in kinds:
+            return kind, None
+    return 'unique', solution
+
+
+def _reference_connected(
+    system: npt.NDArray[np.int_],
+) -> tuple[str, npt.NDArray[np.int_] | None]:
+    """Classifies a `system` with a single connected component."""
+    basis = exact_null_space(system)
+    if len(basis) > 1:
+        return 'ambiguous', None
+    if not basis:
+        return 'infeasible', None
+    vector = basis[0]
+    scale = lcm(*(v.denominator for v in vector))
+    ints = [int(v*scale) for v in vector]
+    divisor = gcd(*ints)
+    ints = [v // divisor for v in ints]
+    if all(v < 0 for v in ints):
+        ints = [-v for v in ints]
+    if not all(v > 0 for v in ints):
+        return 'infeasible', None
+    return 'unique', np.array(ints)
+
+
+def _check(
+    engine: Engine,
+    system: npt.ArrayLike,
+    dense: npt.NDArray[np.int_],
+    kind: str,
+    expected: npt.NDArray[np.int_] | None,
+) -> str | None:
+    """Returns a description of how `engine` disagrees with the reference
+    on `system`, or `None` if it agrees.
+    """
+    try:
+        result = np.asarray(engine(system))
+    except BalancingError as e:
+        if kind == 'unique':
+            return f'raised BalancingError({e}) on a solvable system'
+        return None
+    except Exception as e:
+        return f'raised {type(e).__name__}({e})'
+    if kind == 'infeasible':
+        return f'returned {result.tolist()} for an infeasible system'
+    if kind == 'unique' and not np.array_equal(result, expected):
+        return f'returned {result.tolist()}, expected {expected.tolist()}'
+    if np.any(dense @ result) or not np.all(result > 0):
+        return f'returned {result.tolist()}, which is not a valid solution'
+    return None
+
+
+def _bucket(size: int) -> str:
+    """Returns the power-of-two size bucket `size` falls into."""
+    upper = 1 << (size-1).bit_length()
+    return f'{upper//2 + 1}-{upper}'
+
+
+class HarnessReport:
+    """The results of `run_harness`: correctness mismatches and median
+    solve times per engine and input-size bucket (number of compounds).
+    """
+
+    def __init__(self) -> None:
+        self.cases = 0
+        self.kinds: Counter[str] = Counter()
+        self.mismatches: list[tuple[str, str, str]] = []
+        self.timings: dict[str, dict[str, float]] = {}
+        self.regressions: list[tuple[str, str, float, float]] = []
+
+    def __str__(self) -> str:
+        kinds = ', '.join(f'{n} {kind}' for kind, n in self.kinds.items())
+        lines = [f'{self.cases} cases ({kinds})']
+        for engine, buckets in self.timings.items():
+            for bucket, seconds in buckets.items():
+                lines.append(f'  {engine:>12} {bucket:>8} compounds: '
+                             f'{seconds*1e6:10.1f} us')
+        for engine, equation, problem in self.mismatches:
+            lines.append(f'MISMATCH {engine}: {equation}: {problem}')
+        for engine, bucket, seconds, baseline in self.regressions:
+            lines.append(f'SLOWDOWN {engine} {bucket}: {seconds*1e6:.1f} us '
+                         f'vs baseline {baseline*1e6:.1f} us')
+        return '\n'.join(lines)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches and not self.regressions
+
+    def compare(self, baseline: dict[str, dict[str, float]],
+                threshold: float) -> None:
+        """Records every bucket more than `threshold` (a fraction) slower
+        than in `baseline`.
+        """
+        for engine, buckets in self.timings.items():
+            for bucket, seconds in buckets.items():
+                reference = baseline.get(engine, {}).get(bucket)
+                if reference is not None and seconds > reference*(1+threshold):
+                    self.regressions.append((engine, bucket, seconds,
+                                             reference))
+
+    def assert_ok(self) -> None:
+        """Raises an `AssertionError` describing any failures."""
+        if not self.ok:
+            raise AssertionError(str(self))
+
+
+def run_harness(
+    engines: dict[str, Engine] | None = None,
+    n_cases: int = 200,
+    seed: int = 0,
+    sizes: Sequence[int] = (2, 3, 4, 6, 8, 12, 20, 40),
+    repeats: int = 3,
+) -> HarnessReport:
+    """Cross-checks each engine (by default just `solve`) against the exact
+    reference on random reactions and times it per size bucket.
+
+    Each case picks a reactant count from `sizes` and a similar number of
+    products; one case in five has unrelated random products instead, to
+    exercise the infeasible path. Sizes from `COMPOSITE_MIN_SIZE` up give
+    composite reactions of about twice as many compounds (one in five made
+    infeasible), which reach the sparse and multi-component paths of `solve`.
+    """
+    if engines is None:
+        engines = {'solve': solve}
+    rng = random.Random(seed)
+    report = HarnessReport()
+    samples = {name: defaultdict(list) for name in engines}
+    for _ in range(n_cases):
+        n_reactants = rng.choice(sizes)
+        n_products = rng.randint(1, n_reactants+1)
+        if n_reactants >= COMPOSITE_MIN_SIZE:
+            equation_str = random_composite_reaction(
+                rng, 2*n_reactants, infeasible=rng.random() < 0.2,
+            )
+        elif rng.random() < 0.2:
+            equation_str = (
+                ' + '.join(random_formula(rng) for _ in range(n_reactants))
+                + ' -> '
+                + ' + '.join(random_formula(rng) for _ in range(n_products))
+            )
+        else:
+            equation_str = random_reaction(rng, n_reactants, n_products)
+        equation = FrozenEquation.parse_from_string(equation_str)
+        system = stoichiometric_matrix(list(equation.reactants),
+                                       list(equation.products))
+        dense = system.toarray()
+        kind, expected = reference_solution(dense)
+        report.cases += 1
+        report.kinds[kind] += 1
+        bucket = _bucket(dense.shape[1])
+        for name, engine in engines.items():
+            problem = _check(engine, system, dense, kind, expected)
+            if problem is not None:
+                report.mismatches.append((name, equation_str, problem))
+                continue
+            best = float('inf')
+            for _ in range(repeats):
+                start = perf_counter()
+                try:
+                    engine(system)
+                except BalancingError:
+                    pass
+                best = min(best, perf_counter() - start)
+            samples[name][bucket].append(best)
+
+    for name, buckets in samples.items():
+        report.timings[name] = {
+            bucket: float(np.median(times))
+            for bucket, times in sorted(buckets.items(),
+                                        key=lambda kv: int(kv[0].split('-')[0]))
+        }
+    return report
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m chempy.harness',
+        description='Cross-check and time the equation balancer.',
+    )
+    parser.add_argument('--cases', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', help='JSON file of baseline timings')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='allowed slowdown as a fraction (default 0.5)')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write the timings to --baseline')
+    args = parser.parse_args(argv)
+    if args.update_baseline and not args.baseline:
+        parser.error('--update-baseline requires --baseline')
+    if (args.baseline and not args.update_baseline
+            and not os.path.exists(args.baseline)):
+        parser.error(f'baseline file "{args.baseline}" does not exist '
+                     '(use --update-baseline to create it)')
+
+    report = run_harness(n_cases=args.cases, seed=args.seed)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(report.timings, file, indent=2)
+    elif args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            report.compare(json.load(file), args.threshold)
+    print(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
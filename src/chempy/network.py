@@ -0,0 +1,303 @@
+"""
+TODO: Treat reversible reactions (written with "<=>") as two directed edges.
+"""
+
+from .utils import CompoundCounter
+from .compound import Compound
+from .equation import FrozenEquation
+from collections import defaultdict
+from collections.abc import Iterable
+from fractions import Fraction
+from heapq import heappush, heappop
+from itertools import count
+from math import inf, lcm
+
+Expansion = tuple[dict[Compound, int], dict[Compound, list[tuple[int, int]]]]
+"""The best-known cost of each reachable compound, and its producers as
+`(depth, equation index)` pairs: each is the cheapest way to make it within
+that many steps, cheaper than the entries before it."""
+
+
+def _element_mask(*compounds: Compound) -> int:
+    """Returns a bitmask of the atomic numbers of the elements in
+    `compounds`.
+    """
+    mask = 0
+    for compound in compounds:
+        for element in compound.elements:
+            mask |= 1 << element.number
+    return mask
+
+
+class ReactionNetwork:
+    """An index linking compounds to the equations that consume and produce
+    them, for finding reaction pathways.
+
+    The equations are assumed to be balanced: since every step then
+    conserves atoms, equations involving elements absent from the
+    feedstocks are pruned before searching.
+    """
+    __slots__ = (
+        'equations',
+        '_consumers',
+        '_producers',
+        '_reactants',
+        '_products',
+        '_masks',
+        '_expansions',
+    )
+
+    def __init__(self, equations: Iterable[FrozenEquation] = ()) -> None:
+        """Constructs a network from any number of `equations`."""
+        self.equations: list[FrozenEquation] = []
+        self._consumers: defaultdict[Compound, list[int]] = defaultdict(list)
+        self._producers: defaultdict[Compound, list[int]] = defaultdict(list)
+        self._reactants: list[tuple[Compound, ...]] = []
+        self._products: list[tuple[Compound, ...]] = []
+        self._masks: list[int] = []
+        self._expansions: dict[tuple[frozenset[Compound], int | None],
+                               Expansion] = {}
+        for equation in equations:
+            self.add(equation)
+
+    def __len__(self) -> int:
+        return len(self.equations)
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(<{len(self)} equations, '
+                f'{len(self._consumers.keys() | self._producers.keys())} '
+                'compounds>)')
+
+    def add(self, equation: FrozenEquation) -> int:
+        """Adds `equation` to the network and returns its index."""
+        if not isinstance(equation, FrozenEquation):
+            raise TypeError('`ReactionNetwork` only accepts `Equation`s, '
+                            f'not `{equation.__class__.__name__}`s.')
+        equation = equation.freeze()
+        index = len(self.equations)
+        self.equations.append(equation)
+        reactants = tuple(equation.reactants)
+        products = tuple(equation.products)
+        for compound in reactants:
+            self._consumers[compound].append(index)
+        for compound in products:
+            self._producers[compound].append(index)
+        self._reactants.append(reactants)
+        self._products.append(products)
+        self._masks.append(_element_mask(*reactants))
+        self._expansions.clear()
+        return index
+
+    def consumers(self, compound: Compound | str) -> list[int]:
+        """Returns the indices of the equations consuming `compound`."""
+        return list(self._consumers.get(self._as_compound(compound), ()))
+
+    def producers(self, compound: Compound | str) -> list[int]:
+        """Returns the indices of the equations producing `compound`."""
+        return list(self._producers.get(self._as_compound(compound), ()))
+
+    @staticmethod
+    def _as_compound(compound: Compound | str) -> Compound:
+        if isinstance(compound, str):
+            return Compound.parse_from_string(compound)
+        return compound
+
+    def _expand(
+        self,
+        feedstocks: frozenset[Compound],
+        max_depth: int | None,
+    ) -> Expansion:
+        """Finds the cheapest way to make every compound reachable from
+        `feedstocks` in at most `max_depth` steps.
+
+        An equation can fire once all its reactants are made, and costs one
+        plus the cost of its reactants. The result is memoized per feedstock
+        set so later queries only backtrack through it.
+        """
+        key = (feedstocks, max_depth)
+        if key not in self._expansions:
+            if max_depth is None:
+                self._expansions[key] = self._expand_best_first(feedstocks)
+            else:
+                self._expansions[key] = self._expand_layered(feedstocks,
+                                                             max_depth)
+        return self._expansions[key]
+
+    def _expand_best_first(self, feedstocks: frozenset[Compound]) -> Expansion:
+        """A best-first search (Knuth's generalization of Dijkstra's
+        algorithm) without a depth bound. Each equation is visited at most
+        once per reactant.
+        """
+        feed_mask = _element_mask(*feedstocks)
+
+        costs = {compound: 0 for compound in feedstocks}
+        depths = {compound: 0 for compound in feedstocks}
+        producer = {}
+        missing = {}
+        done = set()
+        tiebreak = count()
+        heap = [(0, next(tiebreak), compound) for compound in feedstocks]
+        while heap:
+            cost, _, compound = heappop(heap)
+            if compound in done or cost > costs[compound]:
+                continue
+            done.add(compound)
+            for index in self._consumers.get(compound, ()):
+                # Atom conservation: unreachable if it needs other elements.
+                if self._masks[index] & ~feed_mask:
+                    continue
+                reactants = self._reactants[index]
+                missing[index] = missing.get(index, len(reactants)) - 1
+                if missing[index]:
+                    continue
+                depth = 1 + max(depths[c] for c in reactants)
+                new_cost = 1 + sum(costs[c] for c in reactants)
+                for product in self._products[index]:
+                    if new_cost < costs.get(product, inf):
+                        costs[product] = new_cost
+                        depths[product] = depth
+                        producer[product] = [(depth, index)]
+                        heappush(heap, (new_cost, next(tiebreak), product))
+        return costs, producer
+
+    def _expand_layered(
+        self,
+        feedstocks: frozenset[Compound],
+        max_depth: int,
+    ) -> Expansion:
+        """A search by depth: layer `d` holds the cheapest cost of each
+        compound using at most `d` steps, relaxed from layer `d-1` through
+        the equations consuming a compound whose cost dropped. Unlike the
+        best-first search, a costlier but shallower route is kept when it
+        is the only one within the bound.
+        """
+        feed_mask = _element_mask(*feedstocks)
+        costs = {compound: 0 for compound in feedstocks}
+        producer = defaultdict(list)
+        changed = set(feedstocks)
+        for depth in range(1, max_depth+1):
+            candidates = set()
+            for compound in changed:
+                candidates.update(self._consumers.get(compound, ()))
+            improved = {}
+            for index in candidates:
+                # Atom conservation: unreachable if it needs other elements.
+                if self._masks[index] & ~feed_mask:
+                    continue
+                reactants = self._reactants[index]
+                if not all(c in costs for c in reactants):
+                    continue
+                new_cost = 1 + sum(costs[c] for c in reactants)
+                for product in self._products[index]:
+                    best = improved.get(product, (costs.get(product, inf),))
+                    if new_cost < best[0]:
+                        improved[product] = (new_cost, index)
+            if not improved:
+                break
+            for product, (cost, index) in improved.items():
+                costs[product] = cost
+                producer[product].append((depth, index))
+            changed = set(improved)
+        return costs, dict(producer)
+
+    def reachable(
+        self,
+        feedstocks: Iterable[Compound | str],
+        max_depth: int | None = None,
+    ) -> set[Compound]:
+        """Returns the compounds that can be made from `feedstocks` in at
+        most `max_depth` steps (including the feedstocks themselves).
+        """
+        feedstocks = frozenset(map(self._as_compound, feedstocks))
+        costs, _ = self._expand(feedstocks, max_depth)
+        return set(costs)
+
+    def find_pathway(
+        self,
+        feedstocks: Iterable[Compound | str],
+        target: Compound | str,
+        max_depth: int | None = None,
+    ) -> list[int] | None:
+        """Returns the indices of a short sequence of equations that turns
+        `feedstocks` into `target`, in an order in which they can be run,
+        or `None` if there is none within `max_depth` steps.
+
+        Examples
+        --------
+        >>> from chempy import Equation, ReactionNetwork
+        >>> network = ReactionNetwork([
+        ...     Equation('2H2 + O2 -> 2H2O'),
+        ...     Equation('C + O2 -> CO2'),
+        ...     Equation('CO2 + 4H2 -> CH4 + 2H2O'),
+        ... ])
+        >>> network.find_pathway(['C', 'H2', 'O2'], 'CH4')
+        [1, 2]
+        """
+        feedstocks = frozenset(map(self._as_compound, feedstocks))
+        target = self._as_compound(target)
+        if _element_mask(target) & ~_element_mask(*feedstocks):
+            return None
+        costs, producer = self._expand(feedstocks, max_depth)
+        if target not in costs:
+            return None
+
+        # Each compound is made by its cheapest producer within the steps
+        # left, whose reactants then have one step fewer.
+        pathway = []
+        visited = set()
+        stack = [(target, inf, False)]
+        while stack:
+            compound, budget, expanded = stack.pop()
+            if compound in feedstocks:
+                continue
+            depth, index = next(entry for entry in reversed(producer[compound])
+                                if entry[0] <= budget)
+            if expanded:
+                if index not in visited:
+                    visited.add(index)
+                    pathway.append(index)
+                continue
+            if index in visited:
+                continue
+            stack.append((compound, budget, True))
+            stack.extend((reactant, depth-1, False)
+                         for reactant in self._reactants[index])
+        return pathway
+
+    def compose(self, pathway: list[int]) -> FrozenEquation:
+        """Returns the net `Equation` of running the equations at the
+        indices in `pathway` (in order), scaled so that every intermediate
+        produced is consumed by the later steps.
+
+        The last equation is taken to make the desired product.
+        """
+        if not pathway:
+            raise ValueError('Cannot compose an empty pathway.')
+        multipliers = {pathway[-1]: Fraction(1)}
+        demand = defaultdict(Fraction)
+        for index in reversed(pathway):
+            equation = self.equations[index]
+            if index not in multipliers:
+                multipliers[index] = max((
+                    demand[comp] / coef
+                    for comp, coef in equation.products.items()
+                    if demand[comp] > 0
+                ), default=Fraction(1))
+            for comp, coef in equation.products.items():
+                demand[comp] -= multipliers[index] * coef
+            for comp, coef in equation.reactants.items():
+                demand[comp] += multipliers[index] * coef
+
+        scale = lcm(*(m.denominator for m in multipliers.values()))
+        reactants = CompoundCounter()
+        products = CompoundCounter()
+        for index, multiplier in multipliers.items():
+            equation = self.equations[index]
+            multiplier = int(multiplier * scale)
+            reactants += equation.reactants * multiplier
+            products += equation.products * multiplier
+        for comp in set(reactants).intersection(products):
+            common = min(reactants[comp], products[comp])
+            reactants[comp] -= common
+            products[comp] -= common
+        return FrozenEquation._from_counters(reactants, products).reduced()
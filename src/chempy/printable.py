@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 
 
 class Printable(ABC):
+    __slots__ = ()
+
     def _repr_latex_(self) -> str:
         """IPython/Jupyter LaTeX printing."""
         return fr'$\displaystyle {self.latex()}$'
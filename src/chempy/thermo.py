@@ -0,0 +1,296 @@
+"""
+TODO: Support the 9-coefficient NASA format (multiple temperature ranges).
+TODO: Charged species (the electron "E" in composition fields) are skipped
+until `Element` supports charge.
+"""
+
+from .data import ATOMIC_NUMS
+from .element import Element
+from .compound import Compound
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Sequence
+from scipy import sparse
+from typing import NamedTuple, Self, TYPE_CHECKING
+import numpy as np
+import numpy.typing as npt
+import os
+import warnings
+
+if TYPE_CHECKING:
+    from .equation import FrozenEquation
+
+GAS_CONSTANT = 8.314462618
+"""The molar gas constant in J/(mol K)."""
+
+
+class ReactionProperties(NamedTuple):
+    """Standard reaction enthalpies (J/mol), entropies (J/(mol K)) and Gibbs
+    energies (J/mol) at each of the evaluated temperatures.
+    """
+    enthalpy: npt.NDArray[np.float64]
+    entropy: npt.NDArray[np.float64]
+    gibbs: npt.NDArray[np.float64]
+
+
+class ThermoStore(ABC):
+    """A source of standard-state species properties.
+
+    Subclasses provide `species_properties` and `__contains__`; the reaction
+    properties of any number of equations are then evaluated in one
+    vectorized pass.
+    """
+
+    @abstractmethod
+    def __contains__(self, compound: Compound) -> bool:
+        """Returns `True` if `compound` has data in the store."""
+
+    @abstractmethod
+    def species_properties(
+        self,
+        compounds: Sequence[Compound],
+        temperatures: npt.ArrayLike,
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Returns the molar enthalpies (J/mol) and entropies (J/(mol K)) of
+        `compounds` at `temperatures` (K), each of shape
+        `(len(compounds), len(temperatures))`.
+        """
+
+    def reaction_properties(
+        self,
+        equations: Sequence['FrozenEquation'],
+        temperatures: npt.ArrayLike,
+    ) -> ReactionProperties:
+        """Returns the `ReactionProperties` of each of the balanced
+        `equations` at `temperatures` (K), as arrays of shape
+        `(len(equations), len(temperatures))`.
+        """
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        compound_ids: dict[Compound, int] = {}
+        rows, cols, data = [], [], []
+        for row, equation in enumerate(equations):
+            if not equation.is_balanced():
+                raise ValueError('Reaction properties require a balanced '
+                                 f'equation, not {equation}.')
+            for sign, counter in ((-1, equation.reactants),
+                                  (1, equation.products)):
+                for compound, coef in counter.items():
+                    rows.append(row)
+                    cols.append(compound_ids.setdefault(compound,
+                                                        len(compound_ids)))
+                    data.append(sign*coef)
+        missing = [str(comp) for comp in compound_ids if comp not in self]
+        if missing:
+            raise KeyError(f'No thermodynamic data for {", ".join(missing)}.')
+
+        # Net stoichiometric coefficients, shape (equations, species).
+        nu = sparse.coo_array((data, (rows, cols)),
+                              shape=(len(equations), len(compound_ids)))
+        enthalpy, entropy = self.species_properties(list(compound_ids),
+                                                    temperatures)
+        reaction_enthalpy = nu.tocsr() @ enthalpy
+        reaction_entropy = nu.tocsr() @ entropy
+        return ReactionProperties(
+            reaction_enthalpy,
+            reaction_entropy,
+            reaction_enthalpy - temperatures*reaction_entropy,
+        )
+
+
+class NASAPolynomialStore(ThermoStore):
+    """Species properties from NASA 7-coefficient polynomials.
+
+    Each species has a low (`t_low` to `t_mid`) and a high (`t_mid` to
+    `t_high`) temperature range with coefficients `a1`...`a7` such that
+
+        Cp/R = a1 + a2 T + a3 T^2 + a4 T^3 + a5 T^4
+        H/RT = a1 + a2 T/2 + a3 T^2/3 + a4 T^3/4 + a5 T^4/5 + a6/T
+        S/R  = a1 ln(T) + a2 T + a3 T^2/2 + a4 T^3/3 + a5 T^4/4 + a7
+
+    Species are keyed by `Compound`, i.e. by composition. Adding a species
+    under the name of an existing one replaces its data, while adding a
+    differently named species with the same composition (an isomer or
+    excited state, such as "CH2(S)" next to "CH2") raises a `ValueError`.
+    """
+
+    def __init__(self) -> None:
+        self._index: dict[Compound, int] = {}
+        self._species: list[Compound] = []
+        self._coefficients = np.empty((0, 2, 7))
+        self._ranges = np.empty((0, 3))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, compound: Compound) -> bool:
+        return compound in self._index
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(<{len(self)} species>)'
+
+    @property
+    def compounds(self) -> list[Compound]:
+        """The compounds with data in the store."""
+        return list(self._species)
+
+    def add(
+        self,
+        compound: Compound,
+        low: Sequence[float],
+        high: Sequence[float],
+        t_low: float,
+        t_mid: float,
+        t_high: float,
+    ) -> None:
+        """Adds (or replaces) the polynomials of `compound`."""
+        self.extend([(compound, low, high, t_low, t_mid, t_high)])
+
+    def extend(
+        self,
+        species: Sequence[tuple[Compound, Sequence[float], Sequence[float],
+                                float, float, float]],
+    ) -> None:
+        """Adds (or replaces) the polynomials of many species at once, given
+        as `(compound, low, high, t_low, t_mid, t_high)` tuples.
+
+        Raises a `ValueError` (adding none of them) if a species has the
+        composition of a differently named one.
+        """
+        coefficients = list(self._coefficients)
+        ranges = list(self._ranges)
+        index = dict(self._index)
+        species_list = list(self._species)
+        for compound, low, high, t_low, t_mid, t_high in species:
+            if len(low) != 7 or len(high) != 7:
+                raise ValueError('NASA polynomials have 7 coefficients per '
+                                 f'temperature range (for {compound}).')
+            if not t_low <= t_mid <= t_high:
+                raise ValueError(f'Invalid temperature ranges for {compound}.')
+            entry = (np.array([low, high], dtype=float),
+                     np.array([t_low, t_mid, t_high], dtype=float))
+            if compound in index:
+                existing = species_list[index[compound]]
+                if str(existing) != str(compound):
+                    raise ValueError(f'{compound} has the same composition '
+                                     f'as {existing}, which is already in '
+                                     'the store.')
+                coefficients[index[compound]], ranges[index[compound]] = entry
+            else:
+                index[compound] = len(coefficients)
+                species_list.append(compound)
+                coefficients.append(entry[0])
+                ranges.append(entry[1])
+        self._index = index
+        self._species = species_list
+        self._coefficients = np.array(coefficients).reshape(-1, 2, 7)
+        self._ranges = np.array(ranges).reshape(-1, 3)
+
+    def species_properties(
+        self,
+        compounds: Sequence[Compound],
+        temperatures: npt.ArrayLike,
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        try:
+            ids = np.array([self._index[comp] for comp in compounds],
+                           dtype=np.intp)
+        except KeyError as e:
+            raise KeyError(f'No thermodynamic data for {e.args[0]}.') from None
+        ranges = self._ranges[ids]
+        outside = ((temperatures < ranges[:, [0]])
+                   | (temperatures > ranges[:, [2]]))
+        if np.any(outside):
+            comp = compounds[np.nonzero(outside.any(axis=1))[0][0]]
+            raise ValueError(f'Temperatures outside the valid range of {comp}.')
+
+        # Coefficients per (species, temperature), shape (n, m, 7).
+        use_high = temperatures > ranges[:, [1]]
+        a = self._coefficients[ids[:, None], use_high.astype(np.intp)]
+        t = temperatures
+        a1, a2, a3, a4, a5, a6, a7 = np.moveaxis(a, -1, 0)
+        enthalpy = GAS_CONSTANT * (
+            t*(a1 + t*(a2/2 + t*(a3/3 + t*(a4/4 + t*a5/5)))) + a6
+        )
+        entropy = GAS_CONSTANT * (
+            a1*np.log(t) + t*(a2 + t*(a3/2 + t*(a4/3 + t*a5/4))) + a7
+        )
+        return enthalpy, entropy
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> Self:
+        """Loads a store from a CHEMKIN-format thermo file (the fixed-width
+        four-line NASA polynomial records).
+
+        Species whose composition contains unrecognized elements (such as
+        the electron in ionic species) are skipped, as are (with a warning)
+        species with the same composition as an earlier one, e.g. "CH2(S)"
+        after "CH2".
+        """
+        with open(path, encoding='utf-8') as file:
+            lines = [line.rstrip('\n') for line in file
+                     if line.strip() and not line.startswith('!')]
+
+        default_ranges = None
+        species = []
+        names: dict[Compound, str] = {}
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            keyword = line.split()[0].upper()
+            if keyword.startswith('THERMO'):
+                if i+1 < len(lines) and len(lines[i+1].split()) == 3:
+                    default_ranges = [float(v) for v in lines[i+1].split()]
+                    i += 1
+                i += 1
+                continue
+            if keyword == 'END':
+                break
+            if len(line) < 80 or line[79] != '1' or i+3 >= len(lines):
+                raise ValueError(f'Invalid NASA polynomial record: "{line}"')
+            record = lines[i:i+4]
+            i += 4
+
+            elements = Counter()
+            unknown = False
+            for j in range(24, 44, 5):
+                symbol = record[0][j:j+2].strip().capitalize()
+                count = record[0][j+2:j+5].strip()
+                if not symbol or not count or float(count) == 0:
+                    continue
+                if symbol not in ATOMIC_NUMS:
+                    unknown = True
+                    break
+                elements[Element(symbol)] += int(float(count))
+            if unknown or not elements:
+                continue
+
+            t_low, t_high, t_mid = (record[0][45:55], record[0][55:65],
+                                    record[0][65:73])
+            t_low, t_high = float(t_low), float(t_high)
+            if t_mid.strip():
+                t_mid = float(t_mid)
+            elif default_ranges is not None:
+                t_mid = default_ranges[1]
+            else:
+                raise ValueError('Missing common temperature for '
+                                 f'"{record[0][:18].strip()}".')
+
+            values = [
+                float(row[k:k+15].replace('D', 'E').replace('d', 'e'))
+                for row, n in zip(record[1:], (5, 5, 4))
+                for k in range(0, 15*n, 15)
+            ]
+            high, low = values[:7], values[7:]
+            compound = Compound(elements, record[0][:18].split()[0])
+            if compound in names:
+                if names[compound] != compound.string:
+                    warnings.warn(f'Skipping {compound}, which has the same '
+                                  f'composition as {names[compound]}.',
+                                  stacklevel=2)
+                continue
+            names[compound] = compound.string
+            species.append((compound, low, high, t_low, t_mid, t_high))
+
+        store = cls()
+        store.extend(species)
+        return store
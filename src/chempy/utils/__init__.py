@@ -1,18 +1,35 @@
+from .limits import Limits, DEFAULT_LIMITS, NO_LIMITS
 from .gcd import float_gcd
 from .solve_system import solve
 from .get_index import get_closing_index
 from .tokenize import tokenize_string
+from .lex_equation import lex_equation
 from .parse_tokens import parse_elements_from_tokens
-from .compound_counter import CompoundCounter
+from .frozen_counter import FrozenCounter
+from .compound_counter import CompoundCounter, FrozenCompoundCounter
+from .stoichiometry import (
+    stoichiometric_matrix,
+    dense_stoichiometric_matrix,
+    balancing_system,
+)
 from .no_auto_init import NoAutoInitMeta, NoAutoInitAndABCMeta
 
 __all__ = (
+    'Limits',
+    'DEFAULT_LIMITS',
+    'NO_LIMITS',
     'float_gcd',
     'solve',
     'get_closing_index',
     'tokenize_string',
+    'lex_equation',
     'parse_elements_from_tokens',
+    'FrozenCounter',
     'CompoundCounter',
+    'FrozenCompoundCounter',
+    'stoichiometric_matrix',
+    'dense_stoichiometric_matrix',
+    'balancing_system',
     'NoAutoInitMeta',
     'NoAutoInitAndABCMeta',
 )
@@ -4,6 +4,8 @@ import numpy as np
 
 
 class CompoundCounter(dict):
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f'{{{", ".join([f"{comp.string}: {n}" for comp, n in self.items()])}}}'
     
@@ -36,10 +38,14 @@ class CompoundCounter(dict):
         if not isinstance(other, CompoundCounter):
             raise TypeError('Cannot add `CompoundCounter` to '
                             f'`{other.__class__.__name__}`.')
-        result = self.__class__()
-        for key in set(self.keys()).union(other.keys()):
-            result[key] = self[key] + other[key]
-        return result
+        data = dict(self)
+        for comp, count in other.items():
+            count += data.get(comp, 0)
+            if count != 0:
+                data[comp] = count
+            else:
+                data.pop(comp, None)
+        return self.__class__(data)
     
     def __sub__(self, other: Self) -> Self:
         if not isinstance(other, CompoundCounter):
@@ -53,6 +59,9 @@ class CompoundCounter(dict):
                             f'`{other.__class__.__name__}`.')
         if other == 0:
             return self.__class__()
+        if isinstance(other, int):
+            return self.__class__({comp: count*other for comp, count
+                                   in self.items()})
         data = {comp: count*other for comp, count in self.items()}
         if not np.all([np.isclose(n, np.round(n)) for n in data.values()]):
             raise TypeError('Cannot multiply `CompoundCounter` with a '
@@ -67,6 +76,8 @@ class CompoundCounter(dict):
         if not isinstance(other, int):
             raise TypeError('Cannot divide `CompoundCounter` by '
                             f'`{other.__class__.__name__}`.')
+        if other == 1:
+            return self.copy()
         return self * (1/other)
     
     def __abs__(self) -> Self:
@@ -81,3 +92,37 @@ class CompoundCounter(dict):
     
     def copy(self) -> Self:
         return self.__class__(super().copy())
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self),)
+
+
+class FrozenCompoundCounter(CompoundCounter):
+    """An immutable, hashable `CompoundCounter`.
+
+    Arithmetic still returns new counters, so instances can be shared
+    freely (including across threads) without defensive copies.
+    """
+    __slots__ = ('_hash',)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f'`{self.__class__.__name__}` is immutable.')
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash(frozenset(self.items()))
+            return self._hash
+
+    def copy(self) -> Self:
+        return self
@@ -0,0 +1,37 @@
+from collections import Counter
+from collections.abc import Iterable, Mapping
+
+
+class FrozenCounter(Counter):
+    """A read-only `Counter`.
+
+    Arithmetic and `copy` return plain (mutable) `Counter`s, so everything
+    but in-place modification works as it does on a `Counter`.
+    """
+    __slots__ = ()
+
+    def __init__(self, counts: Mapping | Iterable = ()) -> None:
+        # `Counter.__init__` fills the counter through the blocked `update`.
+        dict.update(self, Counter(counts))
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f'`{self.__class__.__name__}` is immutable.')
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __isub__ = _immutable
+    __iand__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+    subtract = _immutable
+
+    def copy(self) -> Counter:
+        return Counter(self)
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self),)
@@ -1,11 +1,25 @@
+from ..errors import BudgetExceededError
 import numpy as np
 import numpy.typing as npt
 
 
-def float_gcd(nums: npt.NDArray[np.float_], rtol=1e-05, atol=1e-08) -> float:
+def float_gcd(nums: npt.NDArray[np.float_], rtol=1e-05, atol=1e-08,
+              max_iterations: int | None = None) -> float:
+    """Returns the approximate greatest common divisor of `nums`.
+
+    Raises a `BudgetExceededError` if the Euclidean steps exceed
+    `max_iterations` in total (ill-conditioned ratios can take many steps).
+    """
     gcd = nums[0]
+    iterations = 0
     for num in nums[1:]:
         tol = rtol*min(abs(gcd), abs(num)) + atol
         while abs(num) > tol:
+            iterations += 1
+            if max_iterations is not None and iterations > max_iterations:
+                raise BudgetExceededError('Exceeded the iteration budget of '
+                                          f'{max_iterations} while finding '
+                                          'the GCD of the ratios.',
+                                          ratios=np.asarray(nums))
             gcd, num = num, gcd % num
     return gcd
@@ -0,0 +1,51 @@
+from ..data import ARROWS
+from ..errors import ComplexityError
+from .limits import Limits, DEFAULT_LIMITS
+import re
+
+_ARROW_PATTERN = re.compile('|'.join(map(re.escape, ARROWS)))
+
+
+def lex_equation(
+    equation_string: str,
+    limits: Limits | None = None,
+) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    """Splits an equation string into `(coefficient, compound_string)`
+    pairs for its reactants and products.
+
+    The sides may be separated by any of `ARROWS`. Leading coefficients are
+    read directly off each term, leaving the compound strings (with
+    whitespace removed) to be tokenized once by the compound parser. The
+    number of terms and the coefficients are checked against `limits`.
+    """
+    if limits is None:
+        limits = DEFAULT_LIMITS
+    sides = _ARROW_PATTERN.split(''.join(equation_string.split()))
+    if len(sides) != 2:
+        raise ValueError('Invalid equation syntax. Seperate reactants and '
+                         f'products with one of {", ".join(ARROWS)}.')
+
+    reactant_strs = sides[0].split('+')
+    product_strs = sides[1].split('+')
+    n_terms = len(reactant_strs) + len(product_strs)
+    if (limits.max_equation_terms is not None
+        and n_terms > limits.max_equation_terms):
+        raise ComplexityError(f'Equation has {n_terms} terms, more than '
+                              f'the limit of {limits.max_equation_terms}.',
+                              'max_equation_terms', n_terms)
+    max_coef = limits.max_coefficient
+
+    lexed_sides = []
+    for term_strs in (reactant_strs, product_strs):
+        terms = []
+        for term_str in term_strs:
+            compound_str = term_str.lstrip('0123456789')
+            n_digits = len(term_str) - len(compound_str)
+            coef = int(term_str[:n_digits]) if n_digits else 1
+            if max_coef is not None and coef > max_coef:
+                raise ComplexityError(f'Coefficient {coef} in "{term_str}" '
+                                      f'exceeds the limit of {max_coef}.',
+                                      'max_coefficient', coef)
+            terms.append((coef, compound_str))
+        lexed_sides.append(terms)
+    return lexed_sides[0], lexed_sides[1]
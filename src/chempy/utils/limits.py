@@ -0,0 +1,48 @@
+class Limits:
+    """Bounds on the size and complexity of inputs accepted by the parsers
+    and the solver.
+
+    A value of `None` disables the corresponding check.
+
+    `max_equation_terms` defaults to 10,000 so that equations over whole
+    reaction mechanisms (hundreds to thousands of species) parse by
+    default. Solving them stays cheap: `solve` rejects a system with more
+    compounds than elements plus one from its sparse structure, and
+    otherwise only decomposes matrices with one row per element.
+    `solve_timeout` only bounds how long `solve` takes before raising, and
+    is checked between its stages.
+    """
+
+    def __init__(
+        self,
+        max_formula_length: int | None = 256,
+        max_nesting_depth: int | None = 32,
+        max_coefficient: int | None = 10**6,
+        max_equation_terms: int | None = 10_000,
+        solve_timeout: float | None = 10.0,
+        max_gcd_iterations: int | None = 10_000,
+    ) -> None:
+        self.max_formula_length = max_formula_length
+        self.max_nesting_depth = max_nesting_depth
+        self.max_coefficient = max_coefficient
+        self.max_equation_terms = max_equation_terms
+        self.solve_timeout = solve_timeout
+        self.max_gcd_iterations = max_gcd_iterations
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}('
+                f'max_formula_length={self.max_formula_length}, '
+                f'max_nesting_depth={self.max_nesting_depth}, '
+                f'max_coefficient={self.max_coefficient}, '
+                f'max_equation_terms={self.max_equation_terms}, '
+                f'solve_timeout={self.solve_timeout}, '
+                f'max_gcd_iterations={self.max_gcd_iterations})')
+
+
+DEFAULT_LIMITS = Limits()
+"""The `Limits` used when none are passed explicitly. Mutate its attributes
+to change the limits globally."""
+
+NO_LIMITS = Limits(None, None, None, None, None, None)
+"""`Limits` that disable every check, for input that was already validated
+(such as the string of an existing `Compound`)."""
@@ -23,10 +23,11 @@ def parse_elements_from_tokens(
             if (close_idx+1 <= len(tokens)-1
                 and isinstance(tokens[close_idx+1], int)):
                 mul = tokens[close_idx+1]
-                elements += Counter({e: n*mul for e, n in inside.items()})
+                for element, n in inside.items():
+                    elements[element] += n*mul
                 i = close_idx + 2
             else:
-                elements += inside
+                elements.update(inside)
                 i = close_idx + 1
             continue
         if token in RIGHT_DELS:
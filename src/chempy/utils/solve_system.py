@@ -4,32 +4,231 @@ Solver: https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.lsq_
 Alternative: https://stackoverflow.com/questions/9878558/scipy-optimize-leastsq-with-bound-constraints
 """
 
-from ..errors import BalancingError
+from ..errors import BalancingError, BudgetExceededError
 from .gcd import float_gcd
-from scipy.linalg import null_space
+from .limits import Limits, DEFAULT_LIMITS
+from scipy import sparse
+from time import perf_counter
 import numpy as np
 import numpy.typing as npt
 
+SPARSE_MIN_COMPOUNDS = 32
+"""Systems with at least this many compounds are solved on sparse arrays;
+smaller ones are faster as dense arrays, where the overhead of
+`scipy.sparse` dominates."""
 
-def solve(system: npt.NDArray[np.int_]) -> npt.NDArray[np.int_]:
-    # if system.rank() == system.shape[1]:  # nullity == 0
-    #     raise BalancingError('There is no solution.', results = np.array([]))
-    
-    results = null_space(system).T
-
-    for result in results:
-        if np.any(np.isclose(result, 0)):
-            continue
-        signs = result / np.abs(result)
-        if np.allclose(signs, 1) or np.allclose(signs, -1):
-            ratios = result * signs[0]
-            break
+
+def _reduce_system(
+    system: npt.NDArray[np.int_] | sparse.csr_array,
+) -> npt.NDArray[np.int_]:
+    """Returns a dense copy of `system` without the rows that don't
+    constrain the solution (all-zero rows, and for sparse systems also
+    duplicate rows, which are only worth finding at that size).
+
+    For a sparse `system` the reduction is done on the sparse structure, so
+    its cost scales with the number of non-zeros. A `BalancingError` is
+    raised before anything dense is built if a row has a single non-zero
+    entry (forcing that coefficient to zero) or if there are more than one
+    more compounds than constraining rows (the null space then has a
+    dimension above one, so the solution can't be unique).
+    """
+    if sparse.issparse(system):
+        row_nnz = np.diff(system.indptr)
+    else:
+        row_nnz = np.count_nonzero(system, axis=1)
+    if np.any(row_nnz == 1):
+        raise BalancingError('No solution found (an element only appears '
+                             'in one compound).', results=np.array([]))
+    if system.shape[1] > np.count_nonzero(row_nnz) + 1:
+        raise BalancingError('No unique solution found (too few elements '
+                             'for the number of compounds).',
+                             results=np.array([]))
+    reduced = system[row_nnz > 0]
+    if not sparse.issparse(reduced):
+        return reduced
+    reduced = reduced.toarray()
+    return np.unique(reduced, axis=0) if len(reduced) else reduced
+
+
+def _rank(matrix: npt.NDArray) -> int:
+    """Returns the numerical rank of `matrix` from its singular values
+    alone, with the tolerance of `np.linalg.matrix_rank`.
+    """
+    s = np.linalg.svd(matrix, compute_uv=False)
+    tol = np.amax(s, initial=0.) * np.finfo(float).eps * max(matrix.shape)
+    return int(np.sum(s > tol))
+
+
+def _components(
+    system: npt.NDArray[np.int_] | sparse.csr_array,
+) -> list[npt.NDArray[np.intp]]:
+    """Returns the column indices of each connected component of the
+    bipartite graph linking the rows (elements) and columns (compounds) of
+    `system` through its non-zero entries.
+
+    A union-find over the non-zeros of each row; for the small systems
+    typical of equations this is much cheaper than building a graph for
+    `scipy.sparse.csgraph`.
+    """
+    if sparse.issparse(system):
+        rows = np.repeat(np.arange(system.shape[0]), np.diff(system.indptr))
+        cols = system.indices
     else:
+        rows, cols = np.nonzero(system)
+    parent = list(range(system.shape[1]))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Non-zeros are in row order, so each links to the previous one in its
+    # row.
+    rows = rows.tolist()
+    cols = cols.tolist()
+    for i in range(1, len(cols)):
+        if rows[i] == rows[i-1]:
+            parent[find(cols[i])] = find(cols[i-1])
+
+    groups: dict[int, list[int]] = {}
+    for col in range(len(parent)):
+        groups.setdefault(find(col), []).append(col)
+    return [np.array(cols, dtype=np.intp) for cols in groups.values()]
+
+
+def _component_blocks(
+    system: npt.NDArray[np.int_] | sparse.csr_array,
+    components: list[npt.NDArray[np.intp]],
+) -> list[npt.NDArray[np.int_] | sparse.csr_array]:
+    """Returns the sub-matrix of `system` for each of its `components`,
+    restricted to the rows (elements) the component uses.
+
+    A sparse `system` is split in one pass over its non-zeros, and each
+    block is dense unless it has at least `SPARSE_MIN_COMPOUNDS` compounds.
+    """
+    if not sparse.issparse(system):
+        blocks = [system[:, cols] for cols in components]
+        return [block[block.any(axis=1)] for block in blocks]
+
+    coo = system.tocoo()
+    label = np.empty(system.shape[1], dtype=np.intp)
+    position = np.empty(system.shape[1], dtype=np.intp)
+    for i, cols in enumerate(components):
+        label[cols] = i
+        position[cols] = np.arange(len(cols))
+    entry_labels = label[coo.col]
+    order = np.argsort(entry_labels, kind='stable')
+    bounds = np.searchsorted(entry_labels[order],
+                             np.arange(len(components)+1))
+
+    blocks = []
+    for i, cols in enumerate(components):
+        entries = order[bounds[i]:bounds[i+1]]
+        rows, local_rows = np.unique(coo.row[entries], return_inverse=True)
+        local_cols = position[coo.col[entries]]
+        shape = (len(rows), len(cols))
+        if len(cols) >= SPARSE_MIN_COMPOUNDS:
+            blocks.append(sparse.csr_array(
+                (coo.data[entries], (local_rows, local_cols)), shape=shape,
+            ))
+        else:
+            block = np.zeros(shape, dtype=system.dtype)
+            block[local_rows, local_cols] = coo.data[entries]
+            blocks.append(block)
+    return blocks
+
+
+def _solve_connected(
+    system: npt.NDArray[np.int_] | sparse.csr_array,
+    limits: Limits,
+    start: float,
+) -> npt.NDArray[np.int_]:
+    """Solves a `system` whose compounds all (indirectly) share elements,
+    within the budget of a solve that began at `start`.
+    """
+    def check_time(results=None, ratios=None) -> None:
+        if limits.solve_timeout is None:
+            return
+        if perf_counter() - start > limits.solve_timeout:
+            raise BudgetExceededError('Exceeded the time budget of '
+                                      f'{limits.solve_timeout}s while '
+                                      'solving.', results, ratios)
+
+    # At most one more column than rows from here on, so the
+    # decompositions below stay small however many compounds there are.
+    reduced = _reduce_system(system)
+    check_time()
+    nullity = reduced.shape[1] - _rank(reduced)
+    if nullity == 0:
+        raise BalancingError('No solution found.', np.array([]))
+    if nullity > 1:
+        raise BalancingError('No unique solution found (the null space has '
+                             f'dimension {nullity}).', np.array([]))
+    results = np.linalg.svd(reduced)[2][-1:]
+    check_time(results)
+
+    # The single basis vector needs no zero entries and a single sign.
+    result = results[0]
+    signs = np.sign(result)
+    if np.any(np.isclose(result, 0)) or np.any(signs != signs[0]):
         raise BalancingError('No solution found.', results)
+    ratios = result * signs[0]
     
-    solution = ratios / float_gcd(ratios)
+    try:
+        solution = ratios / float_gcd(ratios, max_iterations=limits
+                                                  .max_gcd_iterations)
+    except BudgetExceededError as e:
+        e.results = results
+        raise
+    check_time(results, ratios)
     
     if not np.allclose(solution, np.round(solution)):
         raise BalancingError('Unknown error.', results, ratios, solution)
     
-    return np.round(solution).astype(np.int_)
+    solution = np.round(solution).astype(np.int_)
+    # `allclose` is relative, so large ill-conditioned ratios can round to
+    # a vector that isn't actually a solution.
+    if np.any(system @ solution):
+        raise BalancingError('No exact integer solution found.',
+                             results, ratios, solution)
+    return solution
+
+
+def solve(
+    system: npt.NDArray[np.int_] | sparse.sparray,
+    limits: Limits | None = None,
+) -> npt.NDArray[np.int_]:
+    """Returns the smallest positive integer vector in the null space of
+    `system`, which may be dense or a `scipy.sparse` array. Either way it
+    is solved as a sparse array only if it has at least
+    `SPARSE_MIN_COMPOUNDS` compounds.
+
+    Groups of compounds that share no elements with the rest (such as
+    unrelated reactions written as one equation) are solved independently,
+    each scaled to its smallest integers.
+
+    The work is bounded by `limits.solve_timeout` (seconds) and
+    `limits.max_gcd_iterations`; exceeding either raises a
+    `BudgetExceededError`.
+    """
+    # if system.rank() == system.shape[1]:  # nullity == 0
+    #     raise BalancingError('There is no solution.', results = np.array([]))
+    if limits is None:
+        limits = DEFAULT_LIMITS
+    start = perf_counter()
+    if np.shape(system)[1] >= SPARSE_MIN_COMPOUNDS:
+        system = sparse.csr_array(system)
+    elif sparse.issparse(system):
+        system = system.toarray()
+    else:
+        system = np.asarray(system)
+
+    components = _components(system)
+    if len(components) == 1:
+        return _solve_connected(system, limits, start)
+
+    solution = np.empty(system.shape[1], dtype=np.int_)
+    for cols, block in zip(components, _component_blocks(system, components)):
+        solution[cols] = _solve_connected(block, limits, start)
+    return solution
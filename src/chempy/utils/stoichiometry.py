@@ -0,0 +1,61 @@
+from ..compound import Compound
+from .solve_system import SPARSE_MIN_COMPOUNDS
+from collections.abc import Sequence
+from scipy import sparse
+import numpy as np
+import numpy.typing as npt
+
+
+def stoichiometric_matrix(
+    reactants: Sequence[Compound],
+    products: Sequence[Compound],
+) -> sparse.csr_array:
+    """Returns the sparse stoichiometric matrix of a reaction.
+
+    There is one row per element present (in order of first appearance) and
+    one column per compound, reactants first. Product columns are negated so
+    that balanced coefficients lie in the matrix's null space.
+    """
+    rows, cols, data = [], [], []
+    element_rows = {}
+    for col, compound in enumerate(reactants):
+        for element, freq in compound.elements.items():
+            rows.append(element_rows.setdefault(element, len(element_rows)))
+            cols.append(col)
+            data.append(freq)
+    for col, compound in enumerate(products, start=len(reactants)):
+        for element, freq in compound.elements.items():
+            rows.append(element_rows.setdefault(element, len(element_rows)))
+            cols.append(col)
+            data.append(-freq)
+    shape = (len(element_rows), len(reactants) + len(products))
+    return sparse.coo_array((np.array(data, dtype=np.int_), (rows, cols)),
+                            shape=shape).tocsr()
+
+
+def dense_stoichiometric_matrix(
+    reactants: Sequence[Compound],
+    products: Sequence[Compound],
+) -> npt.NDArray[np.int_]:
+    """Returns the stoichiometric matrix of a reaction as a dense array,
+    built from the cached `Compound.vector`s.
+
+    The layout matches `stoichiometric_matrix`, except that the rows are in
+    atomic number order.
+    """
+    system = np.array([*(comp.vector for comp in reactants),
+                       *(-comp.vector for comp in products)]).T
+    return system[system.any(axis=1)]
+
+
+def balancing_system(
+    reactants: Sequence[Compound],
+    products: Sequence[Compound],
+) -> npt.NDArray[np.int_] | sparse.csr_array:
+    """Returns the stoichiometric matrix of a reaction in the form `solve`
+    works on at its size: sparse if it has at least `SPARSE_MIN_COMPOUNDS`
+    compounds, dense otherwise.
+    """
+    if len(reactants) + len(products) >= SPARSE_MIN_COMPOUNDS:
+        return stoichiometric_matrix(reactants, products)
+    return dense_stoichiometric_matrix(reactants, products)
@@ -1,13 +1,43 @@
 from ..data import  LEFT_DELS, RIGHT_DELS
 from ..element import Element
+from ..errors import ComplexityError
+from .limits import Limits, DEFAULT_LIMITS
 
 
-def tokenize_string(compound_string: str) -> list[Element | str | int]:
-    """Tokenizes a string representing a compound for further parsing."""
+def tokenize_string(
+    compound_string: str,
+    limits: Limits | None = None,
+) -> list[Element | str | int]:
+    """Tokenizes a string representing a compound for further parsing.
+
+    The string's length, delimiter nesting depth and effective atom counts
+    are checked against `limits` in the same pass, raising a
+    `ComplexityError` as soon as one is exceeded. `DEFAULT_LIMITS` are used
+    if `limits` is `None`; pass `NO_LIMITS` to disable the checks.
+    """
+    if limits is None:
+        limits = DEFAULT_LIMITS
     compound_string = compound_string.replace(' ', '')
+    max_length = limits.max_formula_length
+    if max_length is not None and len(compound_string) > max_length:
+        raise ComplexityError(f'Formula "{compound_string[:32]}..." is longer '
+                              f'than the limit of {max_length} characters.',
+                              'max_formula_length', len(compound_string))
+    max_depth = limits.max_nesting_depth
+    max_coef = limits.max_coefficient
+
+    def check_coefficient(n: int) -> None:
+        if max_coef is not None and n > max_coef:
+            raise ComplexityError(f'Coefficient {n} in "{compound_string}" '
+                                  f'exceeds the limit of {max_coef}.',
+                                  'max_coefficient', n)
+
     tokens = []
     num_str = ''
     lower = ''
+    num = None
+    multipliers = []  # group multipliers of the currently open delimiters
+    scale = 1  # product of `multipliers`
     for c in reversed(compound_string):
         if c.isdigit():
             if lower:
@@ -16,22 +46,45 @@ def tokenize_string(compound_string: str) -> list[Element | str | int]:
             num_str = c + num_str
             continue
         if num_str:
-            tokens.insert(0, int(num_str))
+            num = int(num_str)
+            check_coefficient(num)
+            tokens.append(num)
             num_str = ''
-        if c in LEFT_DELS + RIGHT_DELS:
+        if c in RIGHT_DELS:
+            if lower:
+                raise ValueError('Invalid compound syntax '
+                                    f'"{compound_string}"')
+            if max_depth is not None and len(multipliers) >= max_depth:
+                raise ComplexityError(f'"{compound_string}" nests delimiters '
+                                      f'deeper than the limit of {max_depth}.',
+                                      'max_nesting_depth', len(multipliers)+1)
+            multipliers.append(num or 1)
+            scale *= multipliers[-1]
+            check_coefficient(scale)
+            tokens.append(c)
+        elif c in LEFT_DELS:
             if lower:
                 raise ValueError('Invalid compound syntax '
                                     f'"{compound_string}"')
-            tokens.insert(0, c)
+            if multipliers:
+                scale //= multipliers.pop()
+            tokens.append(c)
         elif c.islower():
             lower = c + lower
-        elif lower:
-            tokens.insert(0, Element(c+lower))
-            lower = ''
+            continue
         else:
-            tokens.insert(0, Element(c))
+            check_coefficient(scale * (num or 1))
+            if lower:
+                tokens.append(Element(c+lower))
+                lower = ''
+            else:
+                tokens.append(Element(c))
+        num = None
     if lower:
         raise ValueError(f'Invalid compound syntax "{compound_string}"')
     if num_str:
-        tokens.insert(0, int(num_str))
+        num = int(num_str)
+        check_coefficient(num)
+        tokens.append(num)
+    tokens.reverse()
     return tokens